@@ -182,7 +182,9 @@ class Backtester:
                 if not current_prices:
                     continue
                 
-                # Generate trading decisions
+                # Generate trading decisions; each day is its own pipeline run, so
+                # the fetcher's run memos are cleared rather than kept for the whole backtest
+                self.data_fetcher.clear_memo()
                 try:
                     decisions = await self.mixgo_agent.analyze(
                         tickers=self.tickers,
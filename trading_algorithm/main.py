@@ -16,6 +16,7 @@ from signals.data.fetcher import DataFetcher
 from signals.llm.client import LLMClient
 from signals.utils.progress import progress
 from signals.screener.alpaca_screener import AlpacaScreener
+from signals.utils.http import close_session
 
 # Load environment variables
 load_dotenv()
@@ -95,7 +96,7 @@ async def run_mixgo(args):
                 
                 # Screen for stocks dynamically
                 try:
-                    screened_stocks = screener.screen_stocks(
+                    screened_stocks = await screener.screen_stocks(
                         max_stocks=args.max_stocks or 5,
                         include_active=True,
                         include_movers=True,
@@ -191,8 +192,10 @@ async def run_mixgo(args):
         for ticker, pos in portfolio["positions"].items():
             print(f"   {ticker}: {pos}")
         
-        # Prefetch necessary data to avoid rate limiting during analysis
+        # Prefetch necessary data to avoid rate limiting during analysis; the
+        # fetcher's run memos start empty so no earlier run's fundamentals leak in
         print("Pre-fetching market data...")
+        data_fetcher.clear_memo()
         prefetch_tasks = []
         for ticker in tickers:
             # Pass both the data_fetcher and broker to the prefetch function
@@ -269,33 +272,10 @@ async def run_mixgo(args):
     finally:
         # Always stop progress tracking
         progress.stop()
+        await close_session()
 
 async def prefetch_ticker_data(data_fetcher, broker, ticker, start_date, end_date):
-    """Prefetch data for a ticker with rate limiting"""
-    # Implement rate limiting for API calls
-    semaphore = asyncio.Semaphore(1)  # Only 1 request at a time per ticker
-    
-    async def fetch_with_rate_limit(func, *args, **kwargs):
-        async with semaphore:
-            try:
-                result = func(*args, **kwargs)
-                # Add delay to avoid throttling
-                await asyncio.sleep(1)
-                return result
-            except Exception as e:
-                print(f"Error fetching data for {ticker}: {e}")
-                # Add longer delay on error
-                await asyncio.sleep(2)
-                return None
-    
-    # Get price data directly from Alpaca
-    progress.update_status("data_fetcher", ticker, "Fetching price data from Alpaca")
-    price_df = data_fetcher.get_prices_from_alpaca(ticker, start_date, end_date, broker)
-    
-    # Continue with other data from financial datasets API
-    progress.update_status("data_fetcher", ticker, "Fetching financial metrics")
-    await fetch_with_rate_limit(data_fetcher.get_financial_metrics, ticker, end_date)
-    
+    """Prefetch all data streams for a ticker concurrently"""
     # Use valid line items only
     line_items = [
         "revenue",
@@ -312,29 +292,10 @@ async def prefetch_ticker_data(data_fetcher, broker, ticker, start_date, end_dat
         "outstanding_shares"
     ]
     
-    progress.update_status("data_fetcher", ticker, "Fetching financial line items")
-    await fetch_with_rate_limit(
-        data_fetcher.get_line_items,
-        ticker, 
-        end_date,
-        line_items=line_items
-    )
-    
-    progress.update_status("data_fetcher", ticker, "Fetching insider trades")
-    await fetch_with_rate_limit(
-        data_fetcher.get_insider_trades,
-        ticker,
-        end_date,
-        start_date=start_date
-    )
-    
-    progress.update_status("data_fetcher", ticker, "Fetching company news")
-    await fetch_with_rate_limit(
-        data_fetcher.get_company_news,
-        ticker,
-        end_date,
-        start_date=start_date
-    )
+    # Prices come from Alpaca via data_fetcher.broker; the rest from Financial Datasets.
+    # Request pacing is handled by the data fetcher's rate limiters.
+    progress.update_status("data_fetcher", ticker, "Fetching market and financial data")
+    await data_fetcher.fetch_ticker_bundle(ticker, end_date, start_date, line_items=line_items)
     
     progress.update_status("data_fetcher", ticker, "Data prefetch complete")
 
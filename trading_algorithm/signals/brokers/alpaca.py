@@ -195,15 +195,22 @@ class AlpacaBroker(Broker):
             print(f"Error cancelling order: {e}")
             return False
     
-    async def close_position(self, ticker: str, direction: str) -> OrderStatus:
+    async def close_position(
+        self,
+        ticker: str,
+        direction: str,
+        position: Optional[Position] = None
+    ) -> OrderStatus:
         """Close an existing position."""
         if not self.api:
             raise Exception("Not authenticated. Call connect() first.")
         
         try:
-            # Get current position
-            position = self.api.get_position(ticker)
-            quantity = abs(int(position.qty))
+            # Get current position, unless the caller already has it
+            if position is None:
+                quantity = abs(int(self.api.get_position(ticker).qty))
+            else:
+                quantity = position.quantity
             
             # Map direction to correct close action
             close_action = "sell" if direction == "long" else "buy"
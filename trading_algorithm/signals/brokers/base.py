@@ -78,13 +78,19 @@ class Broker(ABC):
         pass
     
     @abstractmethod
-    async def close_position(self, ticker: str, direction: str) -> OrderStatus:
+    async def close_position(
+        self,
+        ticker: str,
+        direction: str,
+        position: Optional[Position] = None
+    ) -> OrderStatus:
         """
         Close an existing position.
         
         Args:
             ticker: Ticker symbol
             direction: Direction of position to close ("long" or "short")
+            position: Already-fetched position to close, skips the position lookup when given
             
         Returns:
             OrderStatus: Status of the closing order
@@ -1,12 +1,16 @@
 # brokers/ig_index.py
 import aiohttp
 import json
+import logging
+import numpy as np
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
 from brokers.base import Broker, OrderStatus, Position
 
+log = logging.getLogger(__name__)
+
 class IGIndexBroker(Broker):
     """IG Index broker implementation."""
     
@@ -18,24 +22,33 @@ class IGIndexBroker(Broker):
         self.cst = None  # Client Secure Token
         self.x_security_token = None
         self.account_id = None
+        self._prefix = None  # URL prefix frozen at connect() time
+        self._verbs = {}  # HTTP method -> bound session method
         
     async def connect(self, credentials: Dict[str, str]) -> bool:
         """Connect to IG Index API."""
         self.api_key = credentials.get("api_key")
         self.account_id = credentials.get("account_id")
         password = credentials.get("password")
+        env = credentials.get("env", "live")
         
         if not all([self.api_key, self.account_id, password]):
             raise ValueError("Missing required credentials")
         
-        self.session = aiohttp.ClientSession()
+        # Freeze the environment once so requests never branch on it
+        self._prefix = (self.demo_url if env == "demo" else self.base_url) + "/"
         
-        # Authenticate with IG Index
-        headers = {
+        # Headers shared by every request live on the session itself
+        self.session = aiohttp.ClientSession(headers={
             "Content-Type": "application/json; charset=UTF-8",
             "Accept": "application/json; charset=UTF-8",
             "X-IG-API-KEY": self.api_key,
-            "Version": "2"
+        })
+        self._verbs = {
+            "GET": self.session.get,
+            "POST": self.session.post,
+            "PUT": self.session.put,
+            "DELETE": self.session.delete,
         }
         
         payload = {
@@ -45,19 +58,23 @@ class IGIndexBroker(Broker):
         
         try:
             async with self.session.post(
-                f"{self.base_url}/session", 
-                headers=headers,
+                self._prefix + "session",
+                headers={"Version": "2"},
                 json=payload
             ) as response:
                 if response.status == 200:
                     self.cst = response.headers.get("CST")
                     self.x_security_token = response.headers.get("X-SECURITY-TOKEN")
+                    self.session.headers.update({
+                        "CST": self.cst,
+                        "X-SECURITY-TOKEN": self.x_security_token,
+                    })
                     return True
                 else:
                     error_data = await response.json()
                     raise Exception(f"Authentication failed: {error_data}")
-        except Exception as e:
-            print(f"Error connecting to IG Index: {e}")
+        except Exception:
+            log.exception("Error connecting to IG Index")
             return False
     
     async def _make_request(self, method, endpoint, data=None, version="2"):
@@ -65,28 +82,17 @@ class IGIndexBroker(Broker):
         if not self.session or not self.cst or not self.x_security_token:
             raise Exception("Not authenticated. Call connect() first.")
         
-        headers = {
-            "Content-Type": "application/json; charset=UTF-8",
-            "Accept": "application/json; charset=UTF-8",
-            "X-IG-API-KEY": self.api_key,
-            "CST": self.cst,
-            "X-SECURITY-TOKEN": self.x_security_token,
-            "Version": version
-        }
-        
-        url = f"{self.base_url}/{endpoint}"
-        
         try:
-            async with getattr(self.session, method.lower())(
-                url, headers=headers, json=data
+            async with self._verbs[method](
+                self._prefix + endpoint, headers={"Version": version}, json=data
             ) as response:
                 if response.status in [200, 201]:
                     return await response.json()
                 else:
                     error_data = await response.json()
                     raise Exception(f"API request failed: {error_data}")
-        except Exception as e:
-            print(f"Error making request to IG Index: {e}")
+        except Exception:
+            log.exception("Error making request to IG Index")
             raise
     
     async def get_account_info(self) -> Dict[str, Any]:
@@ -97,32 +103,39 @@ class IGIndexBroker(Broker):
     async def get_positions(self) -> List[Position]:
         """Get current positions."""
         response = await self._make_request("GET", "positions")
+        raw_positions = response.get("positions", [])
+        
+        position_data = [position.get("position", {}) for position in raw_positions]
+        market_data = [position.get("market", {}) for position in raw_positions]
+        
+        # Collect raw arrays first so the P&L percentage is computed in one pass
+        is_long = np.array([data.get("direction") == "BUY" for data in position_data], dtype=bool)
+        average_prices = np.fromiter(
+            (data.get("level", 0) for data in position_data), dtype=float, count=len(position_data)
+        )
+        current_prices = np.fromiter(
+            (data.get("bid", 0) for data in market_data), dtype=float, count=len(market_data)  # Use bid for simplicity
+        )
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            profit_loss_pcts = np.where(
+                is_long,
+                (current_prices - average_prices) / average_prices,
+                (average_prices - current_prices) / average_prices
+            ) * 100.0
         
         positions = []
-        for position in response.get("positions", []):
-            position_data = position.get("position", {})
-            market_data = position.get("market", {})
-            
-            direction = "long" if position_data.get("direction") == "BUY" else "short"
-            quantity = position_data.get("size", 0)
-            average_price = position_data.get("level", 0)
-            current_price = market_data.get("bid", 0)  # Use bid for simplicity
-            
-            profit_loss = position_data.get("profit", {}).get("value", 0)
-            profit_loss_pct = (
-                (current_price - average_price) / average_price * 100
-                if direction == "long" else
-                (average_price - current_price) / average_price * 100
-            )
-            
+        for pos_data, mkt_data, long, average_price, current_price, profit_loss_pct in zip(
+            position_data, market_data, is_long, average_prices, current_prices, profit_loss_pcts
+        ):
             positions.append(Position(
-                ticker=market_data.get("epic", ""),
-                direction=direction,
-                quantity=quantity,
-                average_price=average_price,
-                current_price=current_price,
-                profit_loss=profit_loss,
-                profit_loss_pct=profit_loss_pct
+                ticker=mkt_data.get("epic", ""),
+                direction="long" if long else "short",
+                quantity=pos_data.get("size", 0),
+                average_price=float(average_price),
+                current_price=float(current_price),
+                profit_loss=pos_data.get("profit", {}).get("value", 0),
+                profit_loss_pct=float(profit_loss_pct)
             ))
         
         return positions
@@ -190,11 +203,17 @@ class IGIndexBroker(Broker):
         except Exception:
             return False
     
-    async def close_position(self, ticker: str, direction: str) -> OrderStatus:
+    async def close_position(
+        self,
+        ticker: str,
+        direction: str,
+        position: Optional[Position] = None
+    ) -> OrderStatus:
         """Close an existing position."""
-        # Get current position to determine quantity
-        positions = await self.get_positions()
-        position = next((p for p in positions if p.ticker == ticker and p.direction == direction), None)
+        # Get current position to determine quantity, unless the caller already has it
+        if position is None:
+            positions = await self.get_positions()
+            position = next((p for p in positions if p.ticker == ticker and p.direction == direction), None)
         
         if not position:
             raise Exception(f"No open {direction} position found for {ticker}")
@@ -1,10 +1,13 @@
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+import logging
 import uuid
 
 from signals.brokers.base import Broker
 from signals.data.models import Position, OrderStatus
 
+log = logging.getLogger(__name__)
+
 class MockBroker(Broker):
     """Mock broker implementation for testing."""
     
@@ -29,7 +32,8 @@ class MockBroker(Broker):
             "short_market_value": 0.0,
         }
         self.positions = {}  # ticker -> Position
-        self.orders = {}  # order_id -> OrderStatus
+        self.orders: List[OrderStatus] = []  # append-only order log
+        self._order_ids: set[str] = set()  # order IDs for O(1) membership checks
         self.ticker_prices = {}  # ticker -> price
     
     async def connect(self, credentials: Dict[str, str]) -> bool:
@@ -117,7 +121,8 @@ class MockBroker(Broker):
         )
         
         # Store the order
-        self.orders[order_id] = order
+        self.orders.append(order)
+        self._order_ids.add(order_id)
         
         # Update positions
         self._update_positions(ticker, direction, quantity, current_price)
@@ -206,7 +211,7 @@ class MockBroker(Broker):
                     self.account_info["cash"] += price * remaining - (price * remaining * 0.5)  # 50% margin
             else:
                 # Error - can't sell what you don't have
-                print(f"Error: Cannot sell {quantity} shares of {ticker}, no long position")
+                log.warning("Cannot sell %d shares of %s: no long position", quantity, ticker)
                 
         elif direction == "short":
             # If long position exists, reduce it first (sell)
@@ -271,7 +276,7 @@ class MockBroker(Broker):
                     self.account_info["cash"] -= price * remaining
             else:
                 # Error - can't cover what you don't have
-                print(f"Error: Cannot cover {quantity} shares of {ticker}, no short position")
+                log.warning("Cannot cover %d shares of %s: no short position", quantity, ticker)
         
         # Clean up if position quantity is 0
         if position.quantity == 0:
@@ -284,18 +289,24 @@ class MockBroker(Broker):
         
         # In our mock, orders are filled immediately, so cancellation is not possible
         # But we'll return success if the order exists
-        return order_id in self.orders
+        return order_id in self._order_ids
     
-    async def close_position(self, ticker: str, direction: str) -> OrderStatus:
+    async def close_position(
+        self,
+        ticker: str,
+        direction: str,
+        position: Optional[Position] = None
+    ) -> OrderStatus:
         """Close an existing position."""
         if not self.connected:
             raise Exception("Not connected. Call connect() first.")
         
         # Check if position exists
-        if ticker not in self.positions:
-            raise Exception(f"No position for {ticker}")
+        if position is None:
+            if ticker not in self.positions:
+                raise Exception(f"No position for {ticker}")
+            position = self.positions[ticker]
         
-        position = self.positions[ticker]
         if position.direction != direction:
             raise Exception(f"No {direction} position for {ticker}")
         
@@ -1,6 +1,23 @@
 
+import functools
+import hashlib
 import json
 import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+
+# On-disk Parquet cache for price DataFrames
+PRICE_CACHE_DIR = Path.home() / ".cache" / "mixgo" / "prices"
+PRICE_CACHE_INTRADAY_TTL = 15 * 60  # seconds, for windows that include today
+PRICE_CACHE_VERSION = 2  # bumped when the cached frame schema changes
+
+# Rejected tickers are retried after this long, in case the rejection was wrong
+INVALID_TICKER_TTL = 7 * 24 * 60 * 60  # seconds
 
 
 class Cache:
@@ -93,6 +110,33 @@ class Cache:
                 print(f"Failed to load from disk cache: {e}")
         return None
 
+    def save_invalid_tickers(self, tickers):
+        """Save tickers the data API has rejected, with when, so later runs skip them"""
+        if not os.path.exists('cache'):
+            os.makedirs('cache')
+        
+        try:
+            with open("cache/invalid_tickers.json", 'w') as f:
+                json.dump(dict(sorted(tickers.items())), f)
+        except Exception as e:
+            print(f"Failed to save invalid tickers: {e}")
+
+    def load_invalid_tickers(self):
+        """Load tickers the data API rejected within INVALID_TICKER_TTL, as ticker -> rejection time"""
+        cache_file = "cache/invalid_tickers.json"
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    rejected = json.load(f)
+                # Entries without a timestamp (the old list format) are dropped
+                if not isinstance(rejected, dict):
+                    return {}
+                cutoff = time.time() - INVALID_TICKER_TTL
+                return {ticker: marked_at for ticker, marked_at in rejected.items() if marked_at >= cutoff}
+            except Exception as e:
+                print(f"Failed to load invalid tickers: {e}")
+        return {}
+
 
 # Global cache instance
 _cache = Cache()
@@ -100,4 +144,96 @@ _cache = Cache()
 
 def get_cache():
     """Get the global cache instance."""
-    return _cache
\ No newline at end of file
+    return _cache
+
+
+def disk_cached_parquet(func):
+    """
+    Cache a price getter's DataFrames as Parquet files keyed by (ticker, start, end).
+
+    Windows ending in the past never change, so those entries are permanent;
+    windows that reach today expire after PRICE_CACHE_INTRADAY_TTL. Empty
+    frames are never cached. The wrapped method must take
+    (self, ticker, start_date, end_date) and honours self.use_cache.
+    """
+    @functools.wraps(func)
+    def wrapper(self, ticker, start_date, end_date):
+        if not getattr(self, "use_cache", True):
+            return func(self, ticker, start_date, end_date)
+
+        key = hashlib.sha256(f"prices|{ticker}|{start_date}|{end_date}|day|v{PRICE_CACHE_VERSION}".encode()).hexdigest()
+        path = PRICE_CACHE_DIR / f"{key}.parquet"
+
+        if path.exists():
+            is_historical = str(end_date) < date.today().isoformat()
+            if is_historical or time.time() - path.stat().st_mtime < PRICE_CACHE_INTRADAY_TTL:
+                try:
+                    return pl.read_parquet(path)
+                except Exception as e:
+                    print(f"Failed to load from disk cache: {e}")
+
+        df = func(self, ticker, start_date, end_date)
+
+        if not df.is_empty():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent readers never see a partial file
+                tmp_path = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+                df.write_parquet(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Failed to save to disk cache: {e}")
+
+        return df
+
+    return wrapper
+
+
+def _freeze(value):
+    """Turn list arguments (e.g. line_items) into hashable tuples for a call key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def coalesce_inflight(func):
+    """
+    Share one underlying call between threads that request the same data at once.
+
+    The first caller for a given set of arguments runs the fetch; any caller
+    arriving while it is still in flight waits for and receives the same result
+    (or exception) instead of issuing a duplicate request. Apply it outermost,
+    above any disk cache decorator. The instance needs an ``_inflight`` dict and
+    an ``_inflight_lock``.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        key = (func.__name__, _freeze(args), tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(self, *args, **kwargs)
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            result = func(self, *args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    return wrapper
@@ -1,14 +1,72 @@
 # mixgo/data/fetcher.py
 import asyncio
+import orjson
 import os
 import random
+import threading
+import time
 import polars as pl
 import requests
-from datetime import datetime
+from pydantic import ValidationError
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
-from signals.data.cache import get_cache
-from signals.data.models import Price, FinancialMetrics, LineItem, InsiderTrade, CompanyNews
+from signals.data.cache import get_cache, disk_cached_parquet, coalesce_inflight, INVALID_TICKER_TTL
+from signals.data.rate_limit import RateLimiter
+from signals.data.models import (
+    FinancialMetrics, LineItem, InsiderTrade, CompanyNews,
+    FinancialMetricsResponse, LineItemResponse, InsiderTradeResponse, CompanyNewsResponse,
+    AlpacaNewsArticle, AlpacaNewsResponse
+)
+
+# Column types of a Financial Datasets price record (mirrors signals.data.models.Price)
+PRICE_SCHEMA = {
+    "open": pl.Float64,
+    "close": pl.Float64,
+    "high": pl.Float64,
+    "low": pl.Float64,
+    "volume": pl.Int64,
+    "time": pl.String,
+}
+
+# Column order and types of every price frame get_prices returns, whichever source answered
+PRICE_FRAME_SCHEMA = {
+    "date": pl.Datetime("us", "UTC"),
+    "open": pl.Float64,
+    "high": pl.Float64,
+    "low": pl.Float64,
+    "close": pl.Float64,
+    "volume": pl.Int64,
+}
+
+def _normalize_prices(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Bring an Alpaca or Financial Datasets price frame to PRICE_FRAME_SCHEMA, sorted by date.
+    
+    Naive timestamps are taken as UTC; zoned ones are converted to it.
+    """
+    if df.is_empty():
+        return df
+    date_type = df.schema["date"]
+    date = pl.col("date")
+    if not isinstance(date_type, pl.Datetime):
+        date = date.cast(pl.Datetime("us"), strict=False)
+    if getattr(date_type, "time_zone", None) is None:
+        date = date.dt.replace_time_zone("UTC")
+    else:
+        date = date.dt.convert_time_zone("UTC")
+    return df.select(
+        date.cast(PRICE_FRAME_SCHEMA["date"]).alias("date"),
+        *[pl.col(column).cast(dtype, strict=False) for column, dtype in PRICE_FRAME_SCHEMA.items() if column != "date"]
+    ).sort("date")
+
+@lru_cache(maxsize=256)
+def _parse_date(date_str: str) -> datetime:
+    """Parse a YYYY-MM-DD date; the same end date repeats for every ticker in a run."""
+    return datetime.fromisoformat(date_str)
 
 class DataFetcher:
     """
@@ -27,60 +85,287 @@ class DataFetcher:
         self.api_key = os.environ.get("FINANCIAL_DATASETS_API_KEY")
         self.base_url = "https://api.financialdatasets.ai"
         self.search_url = "https://api.financialdatasets.ai/financial-metrics/tickers"
+        self.request_timeout = 15  # seconds, so a stalled socket can't pin a worker thread
+        self._request_semaphore = asyncio.Semaphore(32)  # max concurrent requests in fetch_many
+        
+        # Token buckets sized to each API's quota; they only wait once a quota is used up
+        self._fd_limiter = RateLimiter(60, 60)  # Financial Datasets
+        self._alpaca_limiter = RateLimiter(200, 60)  # Alpaca data API
+        
+        # Persistent sessions keep TLS connections alive between calls; one per
+        # API so each only ever sends its own credentials
+        self._session = self._create_session()
+        if self.api_key:
+            self._session.headers.update({"X-API-KEY": self.api_key})
+        
+        self._alpaca_session = self._create_session()
+        alpaca_headers = {
+            "APCA-API-KEY-ID": os.getenv("ALPACA_API_KEY"),
+            "APCA-API-SECRET-KEY": os.getenv("ALPACA_API_SECRET")
+        }
+        self._alpaca_session.headers.update({k: v for k, v in alpaca_headers.items() if v})
+        
+        # Financial metrics fetched during this run: (ticker, end_date, period) -> (limit, metrics)
+        self._metrics_memo: Dict[tuple, tuple] = {}
+        
+        # Line items fetched during this run: (ticker, end_date, line_items, period, limit) -> items
+        self._line_items_memo: Dict[tuple, List[LineItem]] = {}
+        
+        # Runs the two legs of the get_prices hedge; sized like the HTTP pool
+        self._hedge_pool = ThreadPoolExecutor(max_workers=64, thread_name_prefix="price-hedge")
+        
+        # Fetches currently running, shared with concurrent identical calls
+        self._inflight: Dict[tuple, Any] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Tickers Financial Datasets has rejected -> when, persisted so later runs
+        # skip them until INVALID_TICKER_TTL has passed
+        self._invalid_tickers: Dict[str, float] = self.cache.load_invalid_tickers() if self.cache else {}
+    
+    def clear_memo(self):
+        """
+        Forget results memoized during the current pipeline run.
+        
+        Call at the start of each run (main.run_mixgo, each backtest day) so a
+        long-lived fetcher neither grows without bound nor serves stale fundamentals.
+        """
+        self._metrics_memo.clear()
+        self._line_items_memo.clear()
+    
+    def _handle_fd_response(self, response: requests.Response, ticker: str, label: str, mark_invalid: bool = True) -> Optional[bytes]:
+        """
+        Classify a Financial Datasets response in one place.
+        
+        Args:
+            response: Response from the Financial Datasets API
+            ticker: Ticker (or comma-joined tickers) the request was for
+            label: Data type being fetched, used in log messages
+            mark_invalid: Remember the ticker as invalid on an "invalid ticker" 400
+            
+        Returns:
+            The raw response body on success, None for any error
+        """
+        status = response.status_code
+        if status == 200:
+            return response.content
+        
+        if status == 400:
+            try:
+                error_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                error_data = None
+            if self._is_invalid_ticker_error(error_data):
+                print(f"⚠️ Ticker {ticker} not recognized by Financial Datasets API - skipping {label}")
+                if mark_invalid:
+                    self._mark_invalid_ticker(ticker)
+            else:
+                print(f"Bad request for {ticker} {label}: {status} - {response.text}")
+        elif status == 402:
+            print(f"Financial Datasets API credits exhausted for {ticker} - skipping {label}")
+        elif status == 429:
+            print(f"Rate limited for {ticker} {label} - skipping to avoid delays")
+        else:
+            print(f"Error fetching {label} for {ticker}: {status} - {response.text}")
+        return None
+    
+    @staticmethod
+    def _is_invalid_ticker_error(error_data) -> bool:
+        """
+        Whether a 400 body says the ticker itself is unknown.
+        
+        Other "Please provide a valid ..." errors (a date, a line item name) are
+        about the request, not the ticker, and must not blacklist it.
+        """
+        if not isinstance(error_data, dict):
+            return False
+        error = str(error_data.get("error", "")).lower()
+        message = str(error_data.get("message", "")).lower()
+        return "invalid ticker" in error or "please provide a valid ticker" in message
+    
+    def _is_invalid_ticker(self, ticker: str) -> bool:
+        """Whether Financial Datasets rejected the ticker within INVALID_TICKER_TTL."""
+        marked_at = self._invalid_tickers.get(ticker)
+        return marked_at is not None and time.time() - marked_at < INVALID_TICKER_TTL
+    
+    def _mark_invalid_ticker(self, ticker: str):
+        """Record a ticker Financial Datasets rejected and persist the set."""
+        if self._is_invalid_ticker(ticker):
+            return
+        self._invalid_tickers[ticker] = time.time()
+        if self.cache:
+            self.cache.save_invalid_tickers(self._invalid_tickers)
+    
+    def clear_invalid_tickers(self, tickers: Optional[List[str]] = None):
+        """
+        Forget rejected tickers so they are requested again.
+        
+        Args:
+            tickers: Tickers to clear (default: all)
+        """
+        if tickers is None:
+            self._invalid_tickers.clear()
+        else:
+            for ticker in tickers:
+                self._invalid_tickers.pop(ticker, None)
+        if self.cache:
+            self.cache.save_invalid_tickers(self._invalid_tickers)
+    
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create an HTTP session with a connection pool sized for fetch_many."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+        session.mount("https://", adapter)
+        return session
+    
+    async def fetch_many(self, fetch_func, tickers: List[str], *args, **kwargs) -> Dict[str, Any]:
+        """
+        Run a per-ticker getter for many tickers concurrently.
+        
+        The getters are synchronous (agents call them directly), so each call
+        runs in a worker thread and the event loop stays free while requests
+        are in flight.
+        
+        Args:
+            fetch_func: Getter taking the ticker as its first argument (e.g. self.get_prices)
+            tickers: Tickers to fetch
+            *args, **kwargs: Remaining arguments passed to every call
+            
+        Returns:
+            dict: Ticker-to-result mapping
+        """
+        async def fetch_one(ticker):
+            async with self._request_semaphore:
+                return await asyncio.to_thread(fetch_func, ticker, *args, **kwargs)
+        
+        results = await asyncio.gather(*(fetch_one(ticker) for ticker in tickers))
+        return dict(zip(tickers, results))
+    
+    async def fetch_ticker_bundle(
+        self,
+        ticker: str,
+        end_date: str,
+        start_date: Optional[str] = None,
+        line_items: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch every data stream the agents use for one ticker concurrently.
+        
+        A failure in one stream is logged and replaced with an empty result
+        rather than cancelling the others.
+        
+        Args:
+            ticker: Ticker symbol
+            end_date: End date
+            start_date: Start date (optional)
+            line_items: Line items to fetch (default: common items)
+            
+        Returns:
+            dict: prices, financial_metrics, line_items, insider_trades,
+                company_news and market_cap for the ticker
+        """
+        streams = {
+            "prices": (pl.DataFrame(), self.get_prices, (ticker, start_date, end_date), {}),
+            "financial_metrics": ([], self.get_financial_metrics, (ticker, end_date), {}),
+            "line_items": ([], self.get_line_items, (ticker, end_date), {"line_items": line_items}),
+            "insider_trades": ([], self.get_insider_trades, (ticker, end_date), {"start_date": start_date}),
+            "company_news": ([], self.get_company_news, (ticker, end_date), {"start_date": start_date}),
+        }
+        
+        results = await asyncio.gather(
+            *(asyncio.to_thread(func, *args, **kwargs) for _, func, args, kwargs in streams.values()),
+            return_exceptions=True
+        )
+        
+        bundle = {}
+        for (name, (default, _, _, _)), result in zip(streams.items(), results):
+            if isinstance(result, Exception):
+                print(f"Error fetching {name} for {ticker}: {result}")
+                result = default
+            bundle[name] = result
+        
+        # Market cap comes from the metrics already fetched instead of a separate request
+        metrics = bundle["financial_metrics"]
+        bundle["market_cap"] = metrics[0].market_cap if metrics else None
+        return bundle
+    
+    @staticmethod
+    def _error_status(error: Exception) -> Optional[int]:
+        """
+        HTTP status carried by an exception, if any.
+        
+        requests.HTTPError keeps it on the attached response; the Alpaca SDK's
+        APIError exposes it directly as status_code.
+        
+        Args:
+            error: Exception raised by a getter
+            
+        Returns:
+            The status code, or None for non-HTTP failures
+        """
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+        if status is None:
+            status = getattr(error, "status_code", None)
+        return status if isinstance(status, int) else None
     
     async def fetch_with_rate_limit(self, fetch_func, *args, **kwargs):
         """
         Execute a fetch function with proper rate limiting.
         
         Args:
-            fetch_func: Function to execute
+            fetch_func: Function to execute (sync functions run in a worker thread)
             *args, **kwargs: Arguments to pass to the function
             
         Returns:
             The result of the function or None on failure
         """
-        max_retries = 5
-        base_delay = 5  # seconds
+        max_retries = 3
+        base_delay = 1.0  # seconds
+        max_delay = 30.0  # cap on any single backoff
+        jitter = 0.5  # proportional jitter, spreads retries from concurrent callers
         
         for attempt in range(max_retries):
             try:
-                # Add a small delay between calls to prevent bursts
-                await asyncio.sleep(random.uniform(0.5, 2.5))
-                
-                # Call the function
-                result = fetch_func(*args, **kwargs)
+                # Await coroutine getters directly; run blocking ones in a worker
+                # thread so the event loop keeps serving other requests
+                if asyncio.iscoroutinefunction(fetch_func):
+                    result = await fetch_func(*args, **kwargs)
+                else:
+                    result = await asyncio.to_thread(fetch_func, *args, **kwargs)
                 return result
             except Exception as e:
-                error_str = str(e).lower()
+                status = self._error_status(e)
                 
-                # Check if it's a rate limit error
-                if "429" in error_str or "throttled" in error_str:
-                    # Try to extract wait time
-                    wait_time = 0
-                    try:
-                        if "expected available in" in error_str:
-                            wait_str = error_str.split("expected available in")[1]
-                            if "second" in wait_str:
-                                wait_seconds = int(wait_str.split("second")[0].strip())
-                                wait_time = wait_seconds + 1  # Add buffer
-                    except:
-                        pass
-                    
-                    # Default to exponential backoff if no specific time found
-                    if wait_time <= 0:
-                        wait_time = base_delay * (2 ** attempt) + random.uniform(0, 1)
-                    
-                    print(f"Rate limited. Waiting {wait_time:.1f} seconds before retry...")
-                    await asyncio.sleep(wait_time)
-                    continue
-                elif "404" in error_str or "no data found" in error_str:
-                    # Data not found - log and return empty result
+                # Unrecoverable - bad request or no data, retrying won't help
+                if status in (400, 404):
                     print(f"Data not found: {e}")
                     return None if "dataframe" not in str(type(fetch_func)).lower() else pl.DataFrame()
+                
+                if attempt == max_retries - 1:
+                    print(f"Error in fetch: {e}")
+                    break
+                
+                # Recoverable - rate limit, server error or transient failure
+                wait_time = 0
+                if status == 429:
+                    # The server's Retry-After header is authoritative when present
+                    response = getattr(e, "response", None)
+                    if response is not None:
+                        try:
+                            wait_time = float(response.headers.get("Retry-After", 0))
+                        except (TypeError, ValueError):
+                            pass
+                    print(f"Rate limited: {e}")
                 else:
-                    # Other error - log and retry with backoff
                     print(f"Error in fetch: {e}")
-                    await asyncio.sleep(base_delay * (2 ** attempt))
+                
+                # Capped exponential backoff with proportional jitter
+                if wait_time <= 0:
+                    wait_time = min(max_delay, base_delay * (2 ** attempt)) * (1 + random.uniform(0, jitter))
+                
+                print(f"Retrying in {wait_time:.1f} seconds...")
+                await asyncio.sleep(wait_time)
                     
         print(f"Max retries exceeded for fetch operation")
         return None if "dataframe" not in str(type(fetch_func)).lower() else pl.DataFrame()
@@ -100,16 +385,14 @@ class DataFetcher:
             Polars DataFrame with price data (date, open, high, low, close, volume)
         """
         try:
+            end_date_dt = _parse_date(end_date)
+            
             # Ensure start_date is provided, if not default to 1 year before end_date
             if not start_date:
-                from datetime import datetime, timedelta
-                end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
                 start_date = (end_date_dt - timedelta(days=365)).strftime("%Y-%m-%d")
             
             # Add a day to end_date to include that day's data
-            from datetime import datetime, timedelta
-            end_date_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
-            end_date_str = end_date_dt.strftime("%Y-%m-%d")
+            end_date_str = (end_date_dt + timedelta(days=1)).strftime("%Y-%m-%d")
             
             # Format dates for Alpaca API - use ISO format without time component
             start_iso = start_date 
@@ -122,48 +405,33 @@ class DataFetcher:
             
             # Try with IEX feed first (free)
             try:
-                bars = broker.api.get_bars(
-                    ticker, 
-                    timeframe, 
-                    start=start_iso,
-                    end=end_iso,
-                    feed='iex'  # Use IEX feed which is free for paper accounts
-                ).df
+                with self._alpaca_limiter:
+                    bars = broker.api.get_bars(
+                        ticker, 
+                        timeframe, 
+                        start=start_iso,
+                        end=end_iso,
+                        feed='iex'  # Use IEX feed which is free for paper accounts
+                    ).df
             except Exception as iex_error:
                 print(f"IEX feed failed for {ticker}: {iex_error}")
                 # Fallback to default feed
                 print(f"Trying default feed for {ticker}...")
-                bars = broker.api.get_bars(
-                    ticker, 
-                    timeframe, 
-                    start=start_iso,
-                    end=end_iso
-                ).df
+                with self._alpaca_limiter:
+                    bars = broker.api.get_bars(
+                        ticker, 
+                        timeframe, 
+                        start=start_iso,
+                        end=end_iso
+                    ).df
             
             if bars.empty:
                 print(f"No price data found in Alpaca for {ticker} between {start_date} and {end_date}")
                 return pl.DataFrame()
             
-            # Convert pandas DataFrame to Polars DataFrame
-            bars = bars.reset_index()
-            bars = bars.rename(columns={
-                'timestamp': 'date',
-                'open': 'open',
-                'high': 'high',
-                'low': 'low',
-                'close': 'close',
-                'volume': 'volume'
-            })
-            
-            # Convert to Polars DataFrame
-            df = pl.DataFrame({
-                'date': bars['date'].tolist(),
-                'open': bars['open'].tolist(),
-                'high': bars['high'].tolist(),
-                'low': bars['low'].tolist(),
-                'close': bars['close'].tolist(),
-                'volume': bars['volume'].tolist()
-            })
+            # Convert pandas DataFrame to Polars DataFrame via Arrow, no per-value Python objects
+            bars = bars.reset_index().rename(columns={'timestamp': 'date'})
+            df = pl.from_pandas(bars[['date', 'open', 'high', 'low', 'close', 'volume']])
             
             print(f"Successfully fetched {df.height} days of price data for {ticker}")
             return df
@@ -173,10 +441,12 @@ class DataFetcher:
             return pl.DataFrame()
     
     
+    @coalesce_inflight
+    @disk_cached_parquet
     def get_prices(self, ticker: str, start_date: Optional[str], end_date: str) -> pl.DataFrame:
         """
-        Fetch historical price data, preferring Alpaca if available.
-        Returns Polars DataFrame.
+        Fetch historical price data from Alpaca and Financial Datasets concurrently.
+        Returns the first non-empty frame, in PRICE_FRAME_SCHEMA whichever source answered.
         
         Args:
             ticker: Ticker symbol
@@ -184,19 +454,62 @@ class DataFetcher:
             end_date: End date
             
         Returns:
-            Polars DataFrame with price data
+            Polars DataFrame with price data (empty when neither source has any)
         """
-        # Try Alpaca first if broker is available
-        if hasattr(self, 'broker') and self.broker is not None:
-            try:
-                price_df = self.get_prices_from_alpaca(ticker, start_date, end_date, self.broker)
+        if getattr(self, 'broker', None) is None:
+            return self._fetch_normalized_prices(self._get_prices_from_financial_datasets, ticker, start_date, end_date)
+        
+        # Hedge: ask both sources at once and take the first non-empty frame, so an
+        # Alpaca miss or timeout no longer adds a full Financial Datasets round trip
+        futures = [
+            self._hedge_pool.submit(
+                self._fetch_normalized_prices, self.get_prices_from_alpaca, ticker, start_date, end_date, self.broker
+            ),
+            self._hedge_pool.submit(
+                self._fetch_normalized_prices, self._get_prices_from_financial_datasets, ticker, start_date, end_date
+            ),
+        ]
+        try:
+            for future in as_completed(futures):
+                price_df = future.result()
                 if not price_df.is_empty():
                     return price_df
-                else:
-                    print(f"No data from Alpaca for {ticker}, trying Financial Datasets API...")
-            except Exception as e:
-                print(f"Error fetching prices from Alpaca for {ticker}: {e}")
-                print("Falling back to Financial Datasets API...")
+            return pl.DataFrame()
+        finally:
+            # Drops the loser if it hasn't started; a running request just finishes
+            for future in futures:
+                future.cancel()
+    
+    def _fetch_normalized_prices(self, fetch, ticker: str, *args) -> pl.DataFrame:
+        """
+        Run one price source and bring its frame to PRICE_FRAME_SCHEMA.
+        
+        Args:
+            fetch: get_prices_from_alpaca or _get_prices_from_financial_datasets
+            ticker: Ticker symbol
+            *args: The source's remaining arguments
+            
+        Returns:
+            Polars DataFrame with price data (empty when the source failed)
+        """
+        try:
+            return _normalize_prices(fetch(ticker, *args))
+        except Exception as e:
+            print(f"Error normalizing price data for {ticker}: {e}")
+            return pl.DataFrame()
+    
+    def _get_prices_from_financial_datasets(self, ticker: str, start_date: Optional[str], end_date: str) -> pl.DataFrame:
+        """
+        Fetch historical price data from the Financial Datasets API.
+        
+        Args:
+            ticker: Ticker symbol
+            start_date: Start date (optional, defaults to 1 year before end_date)
+            end_date: End date
+            
+        Returns:
+            Polars DataFrame with price data
+        """
         try:
             # Build request URL for Financial Datasets API
             url = f"{self.base_url}/prices/?ticker={ticker}&interval=day&interval_multiplier=1"
@@ -204,9 +517,7 @@ class DataFetcher:
             # Ensure start_date is always provided
             # If not explicitly passed, default to 1 year before end_date
             if not start_date:
-                from datetime import datetime, timedelta
-                end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                default_start_date = (end_date_dt - timedelta(days=365)).strftime("%Y-%m-%d")
+                default_start_date = (_parse_date(end_date) - timedelta(days=365)).strftime("%Y-%m-%d")
                 url += f"&start_date={default_start_date}"
             else:
                 url += f"&start_date={start_date}"
@@ -216,26 +527,22 @@ class DataFetcher:
             print(f"Fetching price data for {ticker} from Financial Datasets API...")
             
             # Make API request
-            headers = {}
-            if self.api_key:
-                headers["X-API-KEY"] = self.api_key
-                
-            response = requests.get(url, headers=headers)
+            with self._fd_limiter:
+                response = self._session.get(url, timeout=self.request_timeout)
             if response.status_code != 200:
                 print(f"Error fetching prices for {ticker}: {response.status_code} - {response.text}")
                 return pl.DataFrame()
                 
-            # Parse response
-            data = response.json()
-            prices = [Price(**p) for p in data.get("prices", [])]
+            # Parse response straight into Polars; the schema plays the role of the Price model
+            data = orjson.loads(response.content)
+            df = pl.DataFrame(data.get("prices", []), schema=PRICE_SCHEMA)
             
-            if not prices:
+            if df.is_empty():
                 print(f"No price data found in Financial Datasets API for {ticker}")
                 return pl.DataFrame()
-                
-            # Convert to Polars DataFrame
-            price_data = [p.model_dump() for p in prices]
-            df = pl.DataFrame(price_data)
+            
+            if df.null_count().sum_horizontal().item() > 0:
+                raise ValueError("price records are missing required fields")
             
             # Convert time column to date and set proper structure
             df = df.with_columns([
@@ -246,9 +553,10 @@ class DataFetcher:
             return df
             
         except Exception as e:
-            print(f"Error in get_prices for {ticker}: {e}")
+            print(f"Error fetching prices from Financial Datasets for {ticker}: {e}")
             return pl.DataFrame()
     
+    @coalesce_inflight
     def get_financial_metrics(self, ticker: str, end_date: str, period: str = "ttm", limit: int = 5) -> List[FinancialMetrics]:
         """
         Fetch financial metrics for a ticker with graceful error handling.
@@ -262,44 +570,35 @@ class DataFetcher:
         Returns:
             List of FinancialMetric objects
         """
+        # A memoized fetch with at least as many records answers this call too
+        memo_key = (ticker, end_date, period)
+        memoized = self._metrics_memo.get(memo_key)
+        if memoized is not None and memoized[0] >= limit:
+            return memoized[1][:limit]
+        
+        if self._is_invalid_ticker(ticker):
+            return []
+        
         try:
             url = f"{self.base_url}/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
             
-            headers = {}
-            if self.api_key:
-                headers["X-API-KEY"] = self.api_key
-                
-            response = requests.get(url, headers=headers)
-            
-            # Handle specific error cases gracefully
-            if response.status_code == 400:
-                # Check if it's an invalid ticker error
-                try:
-                    error_data = response.json()
-                    if "Invalid TICKER" in error_data.get("error", ""):
-                        print(f"⚠️ Ticker {ticker} not recognized by Financial Datasets API - skipping financial metrics")
-                        return []
-                except:
-                    pass
-                print(f"Bad request for {ticker} financial metrics: {response.status_code} - {response.text}")
-                return []
-            elif response.status_code == 402:
-                print(f"Financial Datasets API credits exhausted for {ticker} - skipping financial metrics")
-                return []
-            elif response.status_code == 429:
-                print(f"Rate limited for {ticker} financial metrics - skipping to avoid delays")
-                return []
-            elif response.status_code != 200:
-                print(f"Error fetching financial metrics for {ticker}: {response.status_code} - {response.text}")
+            with self._fd_limiter:
+                response = self._session.get(url, timeout=self.request_timeout)
+            
+            content = self._handle_fd_response(response, ticker, "financial metrics")
+            if content is None:
                 return []
                 
-            data = response.json()
-            return [FinancialMetrics(**m) for m in data.get("financial_metrics", [])]
+            # Validate the raw bytes in one pass, no intermediate dicts
+            metrics = FinancialMetricsResponse.model_validate_json(content).financial_metrics
+            self._metrics_memo[memo_key] = (limit, metrics)
+            return metrics
             
         except Exception as e:
             print(f"Error in get_financial_metrics for {ticker}: {e}")
             return []
     
+    @coalesce_inflight
     def get_line_items(
         self, 
         ticker: str, 
@@ -321,71 +620,101 @@ class DataFetcher:
         Returns:
             List of LineItem objects
         """
-        try:
-            # Default to common line items if none provided
-            if line_items is None:
-                line_items = [
-                    "revenue",
-                    "net_income",
-                    "earnings_per_share",
-                    "free_cash_flow",
-                    "operating_margin",
-                    "gross_margin",
-                    "debt_to_equity",
-                    "return_on_equity",
-                    "cash_and_equivalents",
-                    "total_debt",
-                    "total_assets",
-                    "total_liabilities",
-                    "outstanding_shares"
-                ]
+        return self.get_line_items_batch([ticker], end_date, line_items, period, limit).get(ticker, [])
+    
+    def get_line_items_batch(
+        self, 
+        tickers: List[str], 
+        end_date: str, 
+        line_items: Optional[List[str]] = None,
+        period: str = "ttm", 
+        limit: int = 5
+    ) -> Dict[str, List[LineItem]]:
+        """
+        Fetch specific financial line items for several tickers in one request.
+        
+        Args:
+            tickers: Ticker symbols
+            end_date: End date
+            line_items: List of line items to fetch (default: common items)
+            period: Period type (default: "ttm")
+            limit: Max number of records to return per ticker
             
+        Returns:
+            dict: Ticker-to-LineItem-list mapping (empty list for tickers with no data);
+                tickers whose request failed are left out, so callers can refetch them
+        """
+        # Default to common line items if none provided
+        if line_items is None:
+            line_items = [
+                "revenue",
+                "net_income",
+                "earnings_per_share",
+                "free_cash_flow",
+                "operating_margin",
+                "gross_margin",
+                "debt_to_equity",
+                "return_on_equity",
+                "cash_and_equivalents",
+                "total_debt",
+                "total_assets",
+                "total_liabilities",
+                "outstanding_shares"
+            ]
+        
+        # Tickers already fetched this run with the same request are answered from memory
+        results = {}
+        memo_keys = {ticker: (ticker, end_date, tuple(line_items), period, limit) for ticker in tickers}
+        valid = []
+        for ticker in tickers:
+            memoized = self._line_items_memo.get(memo_keys[ticker])
+            if memoized is not None:
+                results[ticker] = list(memoized)
+            elif self._is_invalid_ticker(ticker):
+                results[ticker] = []
+            else:
+                valid.append(ticker)
+        if not valid:
+            return results
+        label = ", ".join(valid)
+        try:
             url = f"{self.base_url}/financials/search/line-items"
             
-            headers = {}
-            if self.api_key:
-                headers["X-API-KEY"] = self.api_key
-                headers["Content-Type"] = "application/json"
-                
             body = {
-                "tickers": [ticker],
+                "tickers": valid,
                 "line_items": line_items,
                 "end_date": end_date,
                 "period": period,
                 "limit": limit,
             }
             
-            response = requests.post(url, headers=headers, json=body)
-            
-            # Handle specific error cases gracefully
-            if response.status_code == 400:
-                # Check if it's an invalid ticker error
-                try:
-                    error_data = response.json()
-                    if "Invalid TICKER" in error_data.get("error", "") or "Please provide a valid" in error_data.get("message", ""):
-                        print(f"⚠️ Ticker {ticker} not recognized by Financial Datasets API - skipping line items")
-                        return []
-                except:
-                    pass
-                print(f"Bad request for {ticker} line items: {response.status_code} - {response.text}")
-                return []
-            elif response.status_code == 402:
-                print(f"Financial Datasets API credits exhausted for {ticker} - skipping line items")
-                return []
-            elif response.status_code == 429:
-                print(f"Rate limited for {ticker} line items - skipping to avoid delays")
-                return []
-            elif response.status_code != 200:
-                print(f"Error fetching line items for {ticker}: {response.status_code} - {response.text}")
-                return []
+            with self._fd_limiter:
+                response = self._session.post(url, json=body, timeout=self.request_timeout)
+            
+            # Only a single-ticker request tells us which ticker was rejected
+            content = self._handle_fd_response(response, label, "line items", mark_invalid=len(valid) == 1)
+            if content is None:
+                return results
                 
-            data = response.json()
-            return [LineItem(**item) for item in data.get("search_results", [])]
+            search_results = LineItemResponse.model_validate_json(content).search_results
+            
+            # Bucket the combined results back by ticker
+            fetched = {ticker: [] for ticker in valid}
+            requested = {ticker.upper(): ticker for ticker in valid}
+            for item in search_results:
+                ticker = requested.get(item.ticker.upper())
+                if ticker is not None:
+                    fetched[ticker].append(item)
+            for ticker, items in fetched.items():
+                self._line_items_memo[memo_keys[ticker]] = list(items)
+            results.update(fetched)
+            return results
             
         except Exception as e:
-            print(f"Error in get_line_items for {ticker}: {e}")
-            return []
+            print(f"Error in get_line_items for {label}: {e}")
+            return results
     
+    @coalesce_inflight
     def get_insider_trades(
         self, 
         ticker: str, 
@@ -405,47 +734,29 @@ class DataFetcher:
         Returns:
             List of InsiderTrade objects
         """
+        if self._is_invalid_ticker(ticker):
+            return []
+        
         try:
             url = f"{self.base_url}/insider-trades/?ticker={ticker}&filing_date_lte={end_date}"
             if start_date:
                 url += f"&filing_date_gte={start_date}"
             url += f"&limit={limit}"
             
-            headers = {}
-            if self.api_key:
-                headers["X-API-KEY"] = self.api_key
-                
-            response = requests.get(url, headers=headers)
-            
-            # Handle specific error cases gracefully
-            if response.status_code == 400:
-                # Check if it's an invalid ticker error
-                try:
-                    error_data = response.json()
-                    if "Invalid TICKER" in error_data.get("error", "") or "Please provide a valid" in error_data.get("message", ""):
-                        print(f"⚠️ Ticker {ticker} not recognized by Financial Datasets API - skipping insider trades")
-                        return []
-                except:
-                    pass
-                print(f"Bad request for {ticker} insider trades: {response.status_code} - {response.text}")
-                return []
-            elif response.status_code == 402:
-                print(f"Financial Datasets API credits exhausted for {ticker} - skipping insider trades")
-                return []
-            elif response.status_code == 429:
-                print(f"Rate limited for {ticker} insider trades - skipping to avoid delays")
-                return []
-            elif response.status_code != 200:
-                print(f"Error fetching insider trades for {ticker}: {response.status_code} - {response.text}")
+            with self._fd_limiter:
+                response = self._session.get(url, timeout=self.request_timeout)
+            
+            content = self._handle_fd_response(response, ticker, "insider trades")
+            if content is None:
                 return []
                 
-            data = response.json()
-            return [InsiderTrade(**trade) for trade in data.get("insider_trades", [])]
+            return InsiderTradeResponse.model_validate_json(content).insider_trades
             
         except Exception as e:
             print(f"Error in get_insider_trades for {ticker}: {e}")
             return []
     
+    @coalesce_inflight
     def get_company_news(
         self, 
         ticker: str, 
@@ -465,110 +776,143 @@ class DataFetcher:
         Returns:
             List of CompanyNews objects
         """
+        return self.get_company_news_batch([ticker], end_date, start_date, limit)[ticker]
+    
+    def get_company_news_batch(
+        self, 
+        tickers: List[str], 
+        end_date: str,
+        start_date: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict[str, List[CompanyNews]]:
+        """
+        Fetch company news for several tickers, using one Alpaca request for all of them.
+        
+        Args:
+            tickers: Ticker symbols
+            end_date: End date
+            start_date: Start date (optional)
+            limit: Max number of records to return per ticker
+            
+        Returns:
+            dict: Ticker-to-CompanyNews-list mapping
+        """
         try:
             # Try Alpaca News API first if broker is available
             if hasattr(self, 'broker') and self.broker is not None:
-                return self._get_company_news_from_alpaca(ticker, end_date, start_date, limit)
+                return self._get_company_news_from_alpaca(tickers, end_date, start_date, limit)
             
-            # Fallback to Financial Datasets API
-            return self._get_company_news_from_financial_datasets(ticker, end_date, start_date, limit)
+            # Fallback to Financial Datasets API, which only takes one ticker per request
+            return {
+                ticker: self._get_company_news_from_financial_datasets(ticker, end_date, start_date, limit)
+                for ticker in tickers
+            }
             
         except Exception as e:
-            print(f"Error in get_company_news for {ticker}: {e}")
-            return []
+            print(f"Error in get_company_news for {', '.join(tickers)}: {e}")
+            return {ticker: [] for ticker in tickers}
     
     def _get_company_news_from_alpaca(
         self, 
-        ticker: str, 
+        tickers: List[str], 
         end_date: str,
         start_date: Optional[str] = None,
         limit: int = 50
-    ) -> List[CompanyNews]:
+    ) -> Dict[str, List[CompanyNews]]:
         """
-        Fetch company news from Alpaca API.
+        Fetch company news for several tickers from Alpaca API.
+        
+        All tickers go into a single `symbols` query and the articles are
+        demultiplexed by the symbols they mention.
         """
+        company_news = {ticker: [] for ticker in tickers}
+        label = ", ".join(tickers)
         try:
-            from datetime import datetime, timedelta
-            
             # Set up date range
+            end_dt = _parse_date(end_date)
             if start_date:
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+                start_dt = _parse_date(start_date)
             else:
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
                 start_dt = end_dt - timedelta(days=30)  # Default to 30 days
             
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-            
             # Format dates for Alpaca API
             start_formatted = start_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
             end_formatted = end_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
             
             url = "https://data.alpaca.markets/v1beta1/news"
             params = {
-                "symbols": ticker,
+                "symbols": ",".join(tickers),
                 "start": start_formatted,
                 "end": end_formatted,
                 "sort": "desc",
                 "limit": min(limit, 50)  # Alpaca API limit
             }
+            requested = {ticker.upper(): ticker for ticker in tickers}
             
-            # Use broker's API headers for authentication
-            headers = {
-                "APCA-API-KEY-ID": os.getenv("ALPACA_API_KEY"),
-                "APCA-API-SECRET-KEY": os.getenv("ALPACA_API_SECRET")
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                news_articles = data.get("news", [])
+            # Page through the shared feed until every ticker has `limit` articles;
+            # one ticker needs a single page, as before
+            for _ in range(len(tickers)):
+                with self._alpaca_limiter:
+                    response = self._alpaca_session.get(url, params=params, timeout=self.request_timeout)
                 
-                # Convert to CompanyNews objects
-                company_news = []
-                for article in news_articles:
-                    # Only include articles that mention our ticker
-                    if ticker.upper() in [s.upper() for s in article.get("symbols", [])]:
-                        try:
-                            # Map Alpaca news format to our CompanyNews model
-                            # Handle missing fields gracefully
-                            news_item = CompanyNews(
-                                ticker=ticker,
-                                title=article.get("headline", ""),
-                                author=article.get("author", "Alpaca News"),
-                                source=article.get("source", "Alpaca News"),
-                                date=article.get("created_at", ""),
-                                url=article.get("url", ""),
-                                sentiment=None  # Alpaca doesn't provide sentiment
-                            )
-                            company_news.append(news_item)
-                        except Exception as parse_error:
-                            print(f"Error parsing news item for {ticker}: {parse_error}")
-                            # Create a minimal news item if parsing fails
-                            try:
-                                minimal_news = CompanyNews(
-                                    ticker=ticker,
-                                    title=article.get("headline", "News Update"),
-                                    author="Alpaca News",
-                                    source="Alpaca News", 
-                                    date=article.get("created_at", ""),
-                                    url=article.get("url", ""),
-                                    sentiment=None
-                                )
-                                company_news.append(minimal_news)
-                            except:
-                                # Skip this article if we can't parse it at all
-                                continue
+                if response.status_code != 200:
+                    print(f"Error fetching Alpaca news for {label}: {response.status_code} - {response.text}")
+                    break
                 
-                print(f"Successfully fetched {len(company_news)} news articles for {ticker} from Alpaca")
-                return company_news
-            else:
-                print(f"Error fetching Alpaca news for {ticker}: {response.status_code} - {response.text}")
-                return []
+                page = self._parse_alpaca_news_page(response.content, label)
+                for article in page.news:
+                    # Only include articles for the tickers they mention
+                    matched = [requested[symbol] for symbol in {sym.upper() for sym in article.symbols or []} if symbol in requested]
+                    if not matched:
+                        continue
+                    # Map Alpaca news format to our CompanyNews model; the article
+                    # model already validated the fields, so skip re-validation
+                    fields = dict(
+                        title=article.headline or "",
+                        author=article.author or "Alpaca News",
+                        source=article.source or "Alpaca News",
+                        date=article.created_at or "",
+                        url=article.url or "",
+                        sentiment=None  # Alpaca doesn't provide sentiment
+                    )
+                    for ticker in matched:
+                        if len(company_news[ticker]) < limit:
+                            company_news[ticker].append(CompanyNews.model_construct(ticker=ticker, **fields))
+                
+                page_token = page.next_page_token
+                if not page_token or all(len(news) >= limit for news in company_news.values()):
+                    break
+                params["page_token"] = page_token
+            
+            for ticker, news in company_news.items():
+                print(f"Successfully fetched {len(news)} news articles for {ticker} from Alpaca")
+            return company_news
                 
         except Exception as e:
-            print(f"Error fetching Alpaca news for {ticker}: {e}")
-            return []
+            print(f"Error fetching Alpaca news for {label}: {e}")
+            return company_news
+    
+    @staticmethod
+    def _parse_alpaca_news_page(content: bytes, label: str) -> AlpacaNewsResponse:
+        """
+        Validate an Alpaca news page, dropping only the articles that are malformed.
+        
+        The whole page is validated in one pass; only if that fails are the
+        articles validated one at a time.
+        """
+        try:
+            return AlpacaNewsResponse.model_validate_json(content)
+        except ValidationError:
+            pass
+        
+        raw = orjson.loads(content)
+        articles = []
+        for item in raw.get("news") or []:
+            try:
+                articles.append(AlpacaNewsArticle.model_validate(item))
+            except ValidationError as e:
+                print(f"Skipping malformed Alpaca news article for {label}: {e.error_count()} invalid field(s)")
+        return AlpacaNewsResponse.model_construct(news=articles, next_page_token=raw.get("next_page_token"))
     
     def _get_company_news_from_financial_datasets(
         self, 
@@ -586,17 +930,13 @@ class DataFetcher:
                 url += f"&start_date={start_date}"
             url += f"&limit={limit}"
             
-            headers = {}
-            if self.api_key:
-                headers["X-API-KEY"] = self.api_key
-                
-            response = requests.get(url, headers=headers)
+            with self._fd_limiter:
+                response = self._session.get(url, timeout=self.request_timeout)
             if response.status_code != 200:
                 print(f"Error fetching Financial Datasets news for {ticker}: {response.status_code} - {response.text}")
                 return []
                 
-            data = response.json()
-            return [CompanyNews(**news) for news in data.get("news", [])]
+            return CompanyNewsResponse.model_validate_json(response.content).news
             
         except Exception as e:
             print(f"Error fetching Financial Datasets news for {ticker}: {e}")
@@ -616,20 +956,27 @@ class DataFetcher:
             self.cache.set_prices(ticker, price_data)
     
     
-    def get_market_cap(self, ticker: str, end_date: str) -> Optional[float]:
+    def get_market_cap(
+        self,
+        ticker: str,
+        end_date: str,
+        metrics: Optional[List[FinancialMetrics]] = None
+    ) -> Optional[float]:
         """
         Get market cap for a ticker as of end_date.
         
         Args:
             ticker: Ticker symbol
             end_date: Date to get market cap for
+            metrics: Financial metrics the caller already fetched (optional)
             
         Returns:
             Market cap value or None if not available
         """
         try:
-            # Get from financial metrics
-            metrics = self.get_financial_metrics(ticker, end_date, limit=1)
+            # Get from financial metrics, reusing the caller's or memoized ones when available
+            if metrics is None:
+                metrics = self.get_financial_metrics(ticker, end_date, limit=1)
             if metrics and metrics[0].market_cap is not None:
                 return metrics[0].market_cap
                 
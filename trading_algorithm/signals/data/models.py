@@ -126,6 +126,20 @@ class CompanyNewsResponse(BaseModel):
     news: list[CompanyNews]
 
 
+class AlpacaNewsArticle(BaseModel):
+    headline: str | None = None
+    author: str | None = None
+    source: str | None = None
+    created_at: str | None = None
+    url: str | None = None
+    symbols: list[str] | None = None
+
+
+class AlpacaNewsResponse(BaseModel):
+    news: list[AlpacaNewsArticle] = []
+    next_page_token: str | None = None
+
+
 class Position(BaseModel):
     ticker: str
     direction: str  # "long" or "short"
@@ -0,0 +1,66 @@
+# mixgo/data/rate_limit.py
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Leaky-bucket rate limiter allowing max_rate acquisitions per time_period.
+
+    Only waits when the bucket is full, so uncontended calls pay no latency.
+    Safe to share between worker threads (``with limiter:``) and coroutines
+    (``async with limiter:``), since the DataFetcher getters run in both.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_rate: Number of acquisitions allowed per time_period
+            time_period: Window length in seconds
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._leak_rate = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a slot in the bucket and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._level = max(0.0, self._level - (now - self._last_check) * self._leak_rate)
+            self._last_check = now
+
+            wait_time = max(0.0, (self._level + 1 - self.max_rate) / self._leak_rate)
+            self._level += 1
+            return wait_time
+
+    def acquire(self):
+        """Block the calling thread until a slot is available."""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a slot is available."""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
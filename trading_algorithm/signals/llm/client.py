@@ -1,21 +1,100 @@
-from typing import Any, Dict, Type, TypeVar
+import asyncio
+import orjson
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, Optional, Type, TypeVar
 from pydantic import BaseModel
 
 T = TypeVar('T', bound=BaseModel)
 
+# Static instructions lead the user message so the prompt prefix (system prompt +
+# these instructions) is byte-identical across calls and eligible for provider-side
+# prompt caching; only the ticker context after it changes per call. The output
+# keys are enforced by the response schema, so they aren't spelled out here.
+DECISION_INSTRUCTIONS = (
+    "Analyze the trading signals below and make a decision for the ticker. "
+    "Respond with a JSON object containing action, quantity, confidence, and reasoning.\n\n"
+)
+
+DECISION_CONTEXT_TEMPLATE = Template(
+    "Ticker: $ticker\n\n"
+    "Signals: $signals\n\n"
+    "Current Position: $position\n\n"
+    "Current Price: $$$price\n\n"
+    "Available Cash: $$$cash\n\n"
+    "Portfolio Context: $portfolio_context"
+)
+
+# Prompts above this size are built in a worker thread so concurrent LLM calls
+# aren't held up by serialization on the event loop
+LARGE_PROMPT_CHARS = 100_000
+
+def _serialize_field(value: Any, max_chars: Optional[int] = None) -> str:
+    """
+    Serialize a context field to compact JSON for the prompt.
+    
+    Args:
+        value: Field value (dicts of signals, portfolio figures, ...)
+        max_chars: Truncate the serialized text to this many characters (optional)
+        
+    Returns:
+        str: JSON text, truncated with a marker when over budget
+    """
+    text = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars] + " ... [truncated]"
+    return text
+
+def build_decision_prompt(context: Dict[str, Any], max_field_chars: Optional[int] = None) -> str:
+    """
+    Build the user prompt for one ticker decision.
+    
+    Args:
+        context: Ticker context (ticker, signals, position, price, cash, portfolio_context)
+        max_field_chars: Per-field character budget for the serialized dicts (optional)
+        
+    Returns:
+        str: Static instructions followed by the per-ticker context
+    """
+    return DECISION_INSTRUCTIONS + DECISION_CONTEXT_TEMPLATE.substitute(
+        ticker=context['ticker'],
+        signals=_serialize_field(context['signals'], max_field_chars),
+        position=_serialize_field(context['position'], max_field_chars),
+        price=f"{context['price']:,.2f}",
+        cash=f"{context['cash']:,.2f}",
+        portfolio_context=_serialize_field(context['portfolio_context'], max_field_chars)
+    )
+
+@lru_cache(maxsize=None)
+def json_schema_format(output_model: Type[BaseModel]) -> Dict[str, Any]:
+    """Build (once per model) the structured-output response_format for a Pydantic model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": output_model.__name__,
+            "schema": output_model.model_json_schema()
+        }
+    }
+
 class LLMClient:
     """Client for interacting with LLM services."""
     
-    def __init__(self, model_name: str, model_provider: str):
+    def __init__(self, model_name: str, model_provider: str, max_context_tokens: Optional[int] = None):
         """
         Initialize the LLM client.
         
         Args:
             model_name: Name of the LLM model to use
             model_provider: Provider of the LLM model (e.g., OpenAI)
+            max_context_tokens: Token budget per serialized context field, to cap
+                input cost on large portfolios (optional, no limit by default)
         """
         self.model_name = model_name
         self.model_provider = model_provider
+        # ~4 characters per token is close enough for a cost cap
+        self.max_field_chars = max_context_tokens * 4 if max_context_tokens else None
+        # Size of the last prompt; contexts in a run are similar, so it predicts the next one
+        self._last_prompt_chars = 0
     
     async def generate_decision(
         self, 
@@ -30,29 +109,12 @@ class LLMClient:
         # Import here to avoid circular imports
         from signals.utils.llm import call_llm
         
-        # Format the prompt with context info and explicitly ask for JSON
-        user_prompt = (
-            f"Please analyze the following trading signals and make a decision for {context['ticker']}.\n\n"
-            f"Signals: {context['signals']}\n\n"
-            f"Current Position: {context['position']}\n\n"
-            f"Current Price: ${context['price']:,.2f}\n\n"
-            f"Available Cash: ${context['cash']:,.2f}\n\n"
-            f"Portfolio Context: {context['portfolio_context']}\n\n"
-            f"Generate a trading decision with action, quantity, confidence, and reasoning.\n\n"
-            f"IMPORTANT: Your response must be a valid JSON object with these keys:\n"
-            f"- action: One of 'buy', 'sell', 'short', 'cover', or 'hold'\n"
-            f"- quantity: Integer number of shares to trade\n"
-            f"- confidence: Your confidence level from 0-100\n"
-            f"- reasoning: Detailed explanation for the decision\n\n"
-            f"Example format:\n"
-            f"{{\n"
-            f"  \"action\": \"buy\",\n"
-            f"  \"quantity\": 100,\n"
-            f"  \"confidence\": 75.5,\n"
-            f"  \"reasoning\": \"Strong bullish signals...\"\n"
-            f"}}\n\n"
-            f"RESPOND ONLY WITH A VALID JSON OBJECT WITH THESE EXACT KEYS."
-        )
+        # Static instructions first, then the per-ticker context
+        if self._last_prompt_chars > LARGE_PROMPT_CHARS:
+            user_prompt = await asyncio.to_thread(build_decision_prompt, context, self.max_field_chars)
+        else:
+            user_prompt = build_decision_prompt(context, self.max_field_chars)
+        self._last_prompt_chars = len(user_prompt)
         
         # Call the LLM with retry logic
         return await call_llm(
@@ -63,6 +125,7 @@ class LLMClient:
             model_name=self.model_name,
             model_provider=self.model_provider,
             pydantic_model=output_model,
+            response_format=json_schema_format(output_model),
             agent_name="mixgo_agent",
             max_retries=3,
             verbose = verbose
@@ -1,12 +1,50 @@
 # signals/screener/alpaca_screener.py
-import requests
+import asyncio
+import orjson
 import os
+import polars as pl
 from dotenv import load_dotenv
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+
+from signals.utils.cache import FileCache
+from signals.utils.http import get_session
 load_dotenv()
 
+# Warrant/unit/rights endings: any one-letter W, U or R suffix, or one of these pairs
+_INVALID_LAST_CHARS = frozenset("WUR")
+_INVALID_SUFFIX_PAIRS = frozenset({"WS", "WT", "UN", "RT"})
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_ticker(symbol: str) -> bool:
+    """Cached check behind AlpacaScreener._is_valid_ticker; symbols recur across screening passes."""
+    symbol = symbol.upper()
+    
+    # Ensure symbol is reasonable length (1-5 characters typically)
+    if not 1 <= len(symbol) <= 5:
+        return False
+    
+    # Filter out symbols with common warrant/unit/rights suffixes
+    if len(symbol) > 1 and symbol[-1] in _INVALID_LAST_CHARS:
+        return False
+    if len(symbol) > 2 and symbol[-2:] in _INVALID_SUFFIX_PAIRS:
+        return False
+    
+    return True
+
+
+def _valid_ticker_expr(symbol: pl.Expr) -> pl.Expr:
+    """Vectorized form of _is_valid_ticker for an already-uppercased symbol column."""
+    length = symbol.str.len_chars()
+    return (
+        length.is_between(1, 5)
+        & ~((length > 1) & symbol.str.slice(-1).is_in(list(_INVALID_LAST_CHARS)))
+        & ~((length > 2) & symbol.str.slice(-2).is_in(list(_INVALID_SUFFIX_PAIRS)))
+    )
+
 
 @dataclass
 class ScreenedStock:
@@ -23,16 +61,70 @@ class AlpacaScreener:
     Stock screener using Alpaca's market data APIs to dynamically select stocks for analysis.
     """
     
-    def __init__(self, broker=None):
+    def __init__(self, broker=None, ttl: float = 60.0, news_ttl: float = 300.0):
         """
         Initialize the screener with broker connection.
         
         Args:
             broker: Connected Alpaca broker instance
+            ttl: Seconds to reuse cached most-actives and movers responses (0 disables)
+            news_ttl: Seconds to reuse cached news responses (0 disables)
         """
         self.broker = broker
+        self.ttl = ttl
+        self.news_ttl = news_ttl
+        self._cache = FileCache(".cache/alpaca")
+        # Built once, so no per-request env lookups; sent with each request since
+        # the HTTP session is shared with other clients
+        self._headers = {
+            k: v for k, v in {
+                "APCA-API-KEY-ID": os.getenv("ALPACA_API_KEY"),
+                "APCA-API-SECRET-KEY": os.getenv("ALPACA_API_SECRET")
+            }.items() if v
+        }
+    
+    async def _get_json(
+        self,
+        endpoint: str,
+        url: str,
+        params: Dict[str, Any],
+        ttl: float,
+        cache_params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        GET a screener endpoint, answering from the file cache while it is fresh.
+        
+        Args:
+            endpoint: Endpoint name, used as the cache namespace and in errors
+            url: Endpoint URL
+            params: Query parameters
+            ttl: Seconds a cached response stays valid
+            cache_params: Parameters to key the cache on (default: params)
+            
+        Returns:
+            Decoded JSON payload, or None on a non-200 response
+        """
+        key_params = params if cache_params is None else cache_params
+        data = self._cache.get(endpoint, key_params, ttl)
+        if data is not None:
+            return data
+        
+        session = await get_session()
+        async with session.get(url, headers=self._headers, params=params) as response:
+            if response.status != 200:
+                print(f"Error fetching {endpoint}: {response.status} - {await response.text()}")
+                return None
+            data = await response.json(loads=orjson.loads)
+        
+        self._cache.set(endpoint, key_params, data)
+        return data
+    
+    @staticmethod
+    async def _skipped(result):
+        """Stand-in for a screening source that is turned off."""
+        return result
         
-    def get_most_active_stocks(self, by: str = "volume", top: int = 20) -> List[Dict[str, Any]]:
+    async def get_most_active_stocks(self, by: str = "volume", top: int = 20) -> List[Dict[str, Any]]:
         """
         Get most active stocks by volume or trade count.
         
@@ -55,27 +147,18 @@ class AlpacaScreener:
                 "top": min(top, 100)  # Cap at 100 as per API limit
             }
             
-            # Use broker's API headers for authentication
-            headers = {
-                "APCA-API-KEY-ID": os.getenv("ALPACA_API_KEY"),
-                "APCA-API-SECRET-KEY": os.getenv("ALPACA_API_SECRET")
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"Found {len(data.get('most_actives', []))} most active stocks by {by}")
-                return data.get("most_actives", [])
-            else:
-                print(f"Error fetching most active stocks: {response.status_code} - {response.text}")
+            data = await self._get_json("most-actives", url, params, self.ttl)
+            if data is None:
                 return []
+            
+            print(f"Found {len(data.get('most_actives', []))} most active stocks by {by}")
+            return data.get("most_actives", [])
                 
         except Exception as e:
             print(f"Error in get_most_active_stocks: {e}")
             return []
     
-    def get_market_movers(self, top: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+    async def get_market_movers(self, top: int = 20) -> Dict[str, List[Dict[str, Any]]]:
         """
         Get top market movers (gainers and losers).
         
@@ -96,29 +179,20 @@ class AlpacaScreener:
                 "top": min(top, 50)  # Cap at 50 as per API limit
             }
             
-            # Use broker's API headers for authentication
-            headers = {
-                "APCA-API-KEY-ID": os.getenv("ALPACA_API_KEY"),
-                "APCA-API-SECRET-KEY": os.getenv("ALPACA_API_SECRET")
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                gainers = data.get("gainers", [])
-                losers = data.get("losers", [])
-                print(f"Found {len(gainers)} gainers and {len(losers)} losers")
-                return {"gainers": gainers, "losers": losers}
-            else:
-                print(f"Error fetching market movers: {response.status_code} - {response.text}")
+            data = await self._get_json("movers", url, params, self.ttl)
+            if data is None:
                 return {"gainers": [], "losers": []}
+            
+            gainers = data.get("gainers", [])
+            losers = data.get("losers", [])
+            print(f"Found {len(gainers)} gainers and {len(losers)} losers")
+            return {"gainers": gainers, "losers": losers}
                 
         except Exception as e:
             print(f"Error in get_market_movers: {e}")
             return {"gainers": [], "losers": []}
     
-    def get_news_driven_stocks(self, limit: int = 50) -> List[Dict[str, Any]]:
+    async def get_news_driven_stocks(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get stocks with recent news coverage that might drive price movements.
         
@@ -133,14 +207,13 @@ class AlpacaScreener:
                 print("No broker connection available for news screening")
                 return []
             
-            # Get recent news articles (last 24 hours)
-            end_date = datetime.now()
+            # Get recent news articles (last 24 hours), in UTC so the 'Z' suffix is true
+            end_date = datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None)
             start_date = end_date - timedelta(hours=24)
             
             # Format dates according to Alpaca API requirements (RFC-3339 format)
-            # Remove microseconds and ensure proper timezone format
-            start_formatted = start_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-            end_formatted = end_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+            start_formatted = start_date.isoformat() + "Z"
+            end_formatted = end_date.isoformat() + "Z"
             
             url = f"https://data.alpaca.markets/v1beta1/news"
             params = {
@@ -150,40 +223,32 @@ class AlpacaScreener:
                 "limit": limit
             }
             
-            # Use broker's API headers for authentication
-            headers = {
-                "APCA-API-KEY-ID": os.getenv("ALPACA_API_KEY"),
-                "APCA-API-SECRET-KEY": os.getenv("ALPACA_API_SECRET")
-            }
-            
             print(f"Fetching news from {start_formatted} to {end_formatted}")
-            response = requests.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                news_articles = data.get("news", [])
-                
-                # Extract unique symbols from news articles
-                symbols_with_news = {}
-                for article in news_articles:
-                    symbols = article.get("symbols", [])
-                    for symbol in symbols:
-                        if symbol not in symbols_with_news:
-                            symbols_with_news[symbol] = {
-                                "symbol": symbol,
-                                "news_count": 0,
-                                "latest_headline": ""
-                            }
-                        symbols_with_news[symbol]["news_count"] += 1
-                        if not symbols_with_news[symbol]["latest_headline"]:
-                            symbols_with_news[symbol]["latest_headline"] = article.get("headline", "")
-                
-                result = list(symbols_with_news.values())
-                print(f"Found {len(result)} stocks with recent news coverage")
-                return result
-            else:
-                print(f"Error fetching news: {response.status_code} - {response.text}")
+            # The window moves every second, so key the cache on the limit alone;
+            # news_ttl bounds how stale a reused window can be
+            data = await self._get_json("news", url, params, self.news_ttl, cache_params={"limit": limit})
+            if data is None:
                 return []
+            
+            news_articles = data.get("news", [])
+            
+            # One row per (article, symbol) mention, then count per symbol; articles
+            # arrive newest first, so the first non-empty headline is the latest one
+            headline = pl.col("headline").fill_null("")
+            result = (
+                pl.DataFrame(news_articles, schema={"symbols": pl.List(pl.String), "headline": pl.String})
+                .explode("symbols")
+                .drop_nulls("symbols")
+                .group_by("symbols", maintain_order=True)
+                .agg(
+                    news_count=pl.len(),
+                    latest_headline=headline.filter(headline != "").first().fill_null("")
+                )
+                .rename({"symbols": "symbol"})
+                .to_dicts()
+            )
+            print(f"Found {len(result)} stocks with recent news coverage")
+            return result
                 
         except Exception as e:
             print(f"Error in get_news_driven_stocks: {e}")
@@ -199,35 +264,9 @@ class AlpacaScreener:
         Returns:
             True if likely a valid stock ticker
         """
-        symbol = symbol.upper()
-        
-        # Filter out common non-stock suffixes
-        invalid_suffixes = ['W', 'U', 'R', 'WS', 'WT', 'UN', 'RT']
-        
-        # Check for warrant indicators (ends with W after 4+ characters)
-        if len(symbol) > 4 and symbol.endswith('W'):
-            return False
-        
-        # Check for unit indicators (ends with U after 4+ characters)
-        if len(symbol) > 4 and symbol.endswith('U'):
-            return False
-            
-        # Check for rights (ends with R after 4+ characters)
-        if len(symbol) > 4 and symbol.endswith('R'):
-            return False
-        
-        # Filter out symbols with common warrant/unit patterns
-        for suffix in invalid_suffixes:
-            if symbol.endswith(suffix) and len(symbol) > len(suffix):
-                return False
-        
-        # Ensure symbol is reasonable length (1-5 characters typically)
-        if len(symbol) < 1 or len(symbol) > 5:
-            return False
-        
-        return True
+        return _is_valid_ticker(symbol)
     
-    def screen_stocks(
+    async def screen_stocks(
         self, 
         max_stocks: int = 5,
         include_active: bool = True,
@@ -250,96 +289,81 @@ class AlpacaScreener:
         """
         print("\n🔍 Starting comprehensive stock screening...")
         
-        if exclude_symbols is None:
-            exclude_symbols = []
+        # Uppercase once so exclusion is a single vectorized membership test
+        excluded = [s.upper() for s in (exclude_symbols or [])]
         
-        # Convert exclude list to uppercase for consistency
-        exclude_symbols = [s.upper() for s in exclude_symbols]
-        
-        screened_stocks = {}
-        
-        # 1. Get most active stocks
+        # Fetch every enabled source at once; scoring below still runs in a fixed order
         if include_active:
             print("\n📊 Screening most active stocks...")
-            active_stocks = self.get_most_active_stocks(by="volume", top=20)
-            for stock in active_stocks:
-                symbol = stock.get("symbol", "").upper()
-                if symbol and symbol not in exclude_symbols and self._is_valid_ticker(symbol):
-                    if symbol not in screened_stocks:
-                        screened_stocks[symbol] = ScreenedStock(
-                            symbol=symbol,
-                            reason="High volume activity",
-                            volume=stock.get("volume"),
-                            score=3.0  # Base score for active stocks
-                        )
-                    else:
-                        screened_stocks[symbol].score += 3.0
-                        screened_stocks[symbol].reason += " + High volume"
-        
-        # 2. Get market movers
         if include_movers:
             print("\n📈 Screening market movers...")
-            movers = self.get_market_movers(top=15)
-            
-            # Process gainers
-            for gainer in movers.get("gainers", []):
-                symbol = gainer.get("symbol", "").upper()
-                if symbol and symbol not in exclude_symbols and self._is_valid_ticker(symbol):
-                    price_change = gainer.get("change_percent", 0)
-                    if symbol not in screened_stocks:
-                        screened_stocks[symbol] = ScreenedStock(
-                            symbol=symbol,
-                            reason="Strong gainer",
-                            price_change_pct=price_change,
-                            score=4.0  # Higher score for significant movers
-                        )
-                    else:
-                        screened_stocks[symbol].score += 4.0
-                        screened_stocks[symbol].reason += " + Strong gainer"
-                        screened_stocks[symbol].price_change_pct = price_change
-            
-            # Process losers (potential value opportunities)
-            for loser in movers.get("losers", []):
-                symbol = loser.get("symbol", "").upper()
-                if symbol and symbol not in exclude_symbols and self._is_valid_ticker(symbol):
-                    price_change = loser.get("change_percent", 0)
-                    if symbol not in screened_stocks:
-                        screened_stocks[symbol] = ScreenedStock(
-                            symbol=symbol,
-                            reason="Potential value opportunity",
-                            price_change_pct=price_change,
-                            score=2.5  # Moderate score for potential value plays
-                        )
-                    else:
-                        screened_stocks[symbol].score += 2.5
-                        screened_stocks[symbol].reason += " + Value opportunity"
-                        if screened_stocks[symbol].price_change_pct is None:
-                            screened_stocks[symbol].price_change_pct = price_change
-        
-        # 3. Get news-driven stocks
         if include_news:
             print("\n📰 Screening stocks with recent news...")
-            news_stocks = self.get_news_driven_stocks(limit=30)
-            for news_stock in news_stocks:
-                symbol = news_stock.get("symbol", "").upper()
-                news_count = news_stock.get("news_count", 0)
-                if symbol and symbol not in exclude_symbols and self._is_valid_ticker(symbol) and news_count >= 2:
-                    news_score = min(news_count * 1.5, 5.0)  # Cap news score at 5.0
-                    if symbol not in screened_stocks:
-                        screened_stocks[symbol] = ScreenedStock(
-                            symbol=symbol,
-                            reason=f"Recent news coverage ({news_count} articles)",
-                            score=news_score
-                        )
-                    else:
-                        screened_stocks[symbol].score += news_score
-                        screened_stocks[symbol].reason += f" + News coverage ({news_count} articles)"
+        active_stocks, movers, news_stocks = await asyncio.gather(
+            self.get_most_active_stocks(by="volume", top=20) if include_active else self._skipped([]),
+            self.get_market_movers(top=15) if include_movers else self._skipped({"gainers": [], "losers": []}),
+            self.get_news_driven_stocks(limit=30) if include_news else self._skipped([])
+        )
+        
+        # 1-3. Stack every source's candidates into one frame, one row per mention,
+        # in scoring order: actives, gainers, losers, news
+        active_rows = pl.DataFrame(active_stocks, schema={"symbol": pl.String, "volume": pl.Int64}).with_columns(
+            score=pl.lit(3.0),  # Base score for active stocks
+            reason=pl.lit("High volume activity"),
+            extra_reason=pl.lit(" + High volume")
+        )
+        gainer_rows = pl.DataFrame(movers.get("gainers", []), schema={"symbol": pl.String, "change_percent": pl.Float64}).select(
+            "symbol",
+            gain_pct=pl.col("change_percent").fill_null(0),
+            score=pl.lit(4.0),  # Higher score for significant movers
+            reason=pl.lit("Strong gainer"),
+            extra_reason=pl.lit(" + Strong gainer")
+        )
+        loser_rows = pl.DataFrame(movers.get("losers", []), schema={"symbol": pl.String, "change_percent": pl.Float64}).select(
+            "symbol",
+            loss_pct=pl.col("change_percent").fill_null(0),
+            score=pl.lit(2.5),  # Moderate score for potential value plays
+            reason=pl.lit("Potential value opportunity"),
+            extra_reason=pl.lit(" + Value opportunity")
+        )
+        news_count = pl.col("news_count")
+        news_rows = pl.DataFrame(news_stocks, schema={"symbol": pl.String, "news_count": pl.Int64}).filter(news_count >= 2).select(
+            "symbol",
+            score=(news_count * 1.5).clip(upper_bound=5.0),  # Cap news score at 5.0
+            reason=pl.format("Recent news coverage ({} articles)", news_count),
+            extra_reason=pl.format(" + News coverage ({} articles)", news_count)
+        )
+        candidates = pl.concat([active_rows, gainer_rows, loser_rows, news_rows], how="diagonal").with_columns(
+            pl.col("symbol").fill_null("").str.to_uppercase()
+        )
         
-        # 4. Rank and filter results
-        ranked_stocks = sorted(screened_stocks.values(), key=lambda x: x.score, reverse=True)
+        # 4. Merge mentions per symbol and rank. A gainer's move replaces any earlier
+        # one, a loser's only fills a gap; reasons chain in scoring order
+        # Validate each distinct symbol once, however many sources mention it
+        allowed = (
+            candidates
+            .select(pl.col("symbol").unique(maintain_order=True))
+            .filter(_valid_ticker_expr(pl.col("symbol")) & ~pl.col("symbol").is_in(excluded))
+            .get_column("symbol")
+        )
+        ranked_stocks = (
+            candidates
+            .filter(pl.col("symbol").is_in(allowed))
+            .group_by("symbol", maintain_order=True)
+            .agg(
+                score=pl.col("score").sum(),
+                reason=pl.col("reason").first() + pl.col("extra_reason").slice(1).str.join(""),
+                volume=pl.col("volume").drop_nulls().first(),
+                price_change_pct=pl.coalesce(
+                    pl.col("gain_pct").drop_nulls().last(),
+                    pl.col("loss_pct").drop_nulls().first()
+                )
+            )
+            .sort("score", descending=True, maintain_order=True)
+        )
         
-        # Take top stocks up to max_stocks limit
-        final_selection = ranked_stocks[:max_stocks]
+        # Take top stocks up to max_stocks limit; only these become ScreenedStock objects
+        final_selection = [ScreenedStock(**row) for row in ranked_stocks.head(max_stocks).iter_rows(named=True)]
         
         print(f"\n✅ Screening complete! Selected {len(final_selection)} stocks:")
         for i, stock in enumerate(final_selection, 1):
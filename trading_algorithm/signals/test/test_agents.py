@@ -0,0 +1,188 @@
+import threading
+import unittest
+import warnings
+from datetime import datetime
+
+import orjson
+import polars as pl
+
+from signals.data.fetcher import DataFetcher
+from trading_system.stanley_drucken import StanleyDruckenmillerAgent
+from trading_system.technical_analyst import TechnicalAnalystAgent
+
+
+class _FakeResponse:
+    """Just enough of requests.Response for DataFetcher._handle_fd_response."""
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.content = orjson.dumps(payload)
+        self.text = self.content.decode()
+
+
+class _LineItemsFetcher(DataFetcher):
+    """DataFetcher whose line-item search is scripted and whose other streams are canned."""
+
+    def __init__(self, fail_batch=True, fail_single=False, market_cap=5e9, revenue=1e9):
+        super().__init__(use_cache=False)
+        self.line_item_requests = []
+        self.fail_batch = fail_batch
+        self.fail_single = fail_single
+        self.market_cap = market_cap
+        self.revenue = revenue
+        self._session.post = self._post
+
+    def _post(self, url, json=None, timeout=None):
+        tickers = json["tickers"]
+        self.line_item_requests.append(list(tickers))
+        if (len(tickers) > 1 and self.fail_batch) or (len(tickers) == 1 and self.fail_single):
+            return _FakeResponse(400, {"error": "Bad Request", "message": "Invalid line item"})
+        return _FakeResponse(200, {"search_results": [
+            {"ticker": ticker, "report_period": "2024-12-31", "period": "ttm", "currency": "USD", "revenue": self.revenue}
+            for ticker in tickers
+        ]})
+
+    def get_financial_metrics(self, ticker, end_date, period="ttm", limit=5):
+        return []
+
+    def get_market_cap(self, ticker, end_date, metrics=None):
+        return self.market_cap
+
+    def get_prices(self, ticker, start_date, end_date):
+        return pl.DataFrame({"close": [100.0, 101.0]})
+
+
+class TestDruckenmillerLineItemFallback(unittest.TestCase):
+    tickers = ["AAPL", "MSFT", "NVDA"]
+
+    def test_failed_batch_falls_back_to_per_ticker_line_items(self):
+        fetcher = _LineItemsFetcher(fail_batch=True)
+        agent = StanleyDruckenmillerAgent()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            signals = agent.analyze(self.tickers, fetcher, "2025-01-01")
+
+        # The batch was tried once, then every ticker got its own request
+        self.assertEqual(fetcher.line_item_requests[0], self.tickers)
+        self.assertCountEqual(fetcher.line_item_requests[1:], [[ticker] for ticker in self.tickers])
+        self.assertEqual(set(signals), set(self.tickers))
+        for signal in signals.values():
+            self.assertNotIn("skipped", signal.reasoning)
+
+    def test_failed_line_items_are_not_reported_as_screened_out(self):
+        fetcher = _LineItemsFetcher(fail_batch=True, fail_single=True)
+        agent = StanleyDruckenmillerAgent()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            signals = agent.analyze(self.tickers, fetcher, "2025-01-01")
+
+        self.assertEqual(signals, {})
+        skipped = [str(warning.message) for warning in caught if "skipping" in str(warning.message)]
+        self.assertEqual(len(skipped), len(self.tickers))
+
+    def test_missing_market_cap_is_not_screened_out(self):
+        # A failed metrics request leaves the market cap unknown, not small
+        fetcher = _LineItemsFetcher(fail_batch=False, market_cap=None)
+        signals = StanleyDruckenmillerAgent().analyze(self.tickers, fetcher, "2025-01-01")
+
+        for signal in signals.values():
+            self.assertNotIn("skipped", signal.reasoning)
+
+    def test_screened_out_signal_gives_the_reason(self):
+        fetcher = _LineItemsFetcher(fail_batch=False, market_cap=5e7)
+        signals = StanleyDruckenmillerAgent().analyze(self.tickers, fetcher, "2025-01-01")
+        self.assertTrue(all(signal.reasoning["skipped"] for signal in signals.values()))
+        self.assertIn("Market cap", signals["AAPL"].reasoning["details"])
+
+        fetcher = _LineItemsFetcher(fail_batch=False, revenue=None)
+        signals = StanleyDruckenmillerAgent().analyze(self.tickers, fetcher, "2025-01-01")
+        self.assertEqual(signals["AAPL"].reasoning["details"], "No reported revenue")
+
+    def test_batch_leaves_failed_tickers_out(self):
+        fetcher = _LineItemsFetcher(fail_batch=True)
+
+        self.assertEqual(fetcher.get_line_items_batch(self.tickers, "2025-01-01"), {})
+        self.assertEqual(len(fetcher.get_line_items("AAPL", "2025-01-01")), 1)
+
+
+class _HedgedPriceFetcher(DataFetcher):
+    """DataFetcher whose two price sources return canned frames; Alpaca can be held back."""
+
+    def __init__(self, alpaca_frame, fd_frame):
+        super().__init__(use_cache=False)
+        self.broker = object()
+        self.alpaca_frame = alpaca_frame
+        self.fd_frame = fd_frame
+        self.release_alpaca = threading.Event()
+        self.alpaca_answered = False
+
+    def get_prices_from_alpaca(self, ticker, start_date, end_date, broker):
+        self.release_alpaca.wait(5)
+        self.alpaca_answered = True
+        return self.alpaca_frame
+
+    def _get_prices_from_financial_datasets(self, ticker, start_date, end_date):
+        return self.fd_frame
+
+
+class TestPriceHedge(unittest.TestCase):
+    fd_frame = pl.DataFrame({
+        "open": [1, 2], "close": [1, 2], "high": [1, 2], "low": [1, 2], "volume": [10, 20],
+        "date": [datetime(2025, 1, 3), datetime(2025, 1, 2)],
+    })
+
+    def test_slow_alpaca_does_not_hold_back_financial_datasets(self):
+        fetcher = _HedgedPriceFetcher(pl.DataFrame(), self.fd_frame)
+        prices = fetcher.get_prices("AAPL", "2025-01-01", "2025-01-03")
+        self.assertFalse(fetcher.alpaca_answered)
+        fetcher.release_alpaca.set()
+
+        self.assertEqual(prices.columns, ["date", "open", "high", "low", "close", "volume"])
+        self.assertEqual(prices["close"].dtype, pl.Float64)
+        self.assertEqual(prices["close"].to_list(), [2.0, 1.0])
+
+    def test_empty_financial_datasets_frame_waits_for_alpaca(self):
+        fetcher = _HedgedPriceFetcher(self.fd_frame, pl.DataFrame())
+        fetcher.release_alpaca.set()
+        self.assertEqual(fetcher.get_prices("AAPL", "2025-01-01", "2025-01-03").height, 2)
+
+
+class _PriceFetcher:
+    """Serves a fixed price frame per ticker."""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def get_prices(self, ticker, start_date, end_date):
+        return self.frames[ticker]
+
+
+class TestTechnicalAnalystPartialPrices(unittest.TestCase):
+    def test_close_only_frame_keeps_close_based_strategies(self):
+        close = [100.0 + (i % 7) - (i % 5) * 0.5 + i * 0.1 for i in range(200)]
+        frames = {
+            "FULL": pl.DataFrame({
+                "close": close,
+                "high": [price * 1.01 for price in close],
+                "low": [price * 0.99 for price in close],
+                "volume": [1e6] * len(close),
+            }),
+            "CLOSE": pl.DataFrame({"close": close}),
+        }
+        signals = TechnicalAnalystAgent().analyze(list(frames), _PriceFetcher(frames), "2025-01-01")
+
+        self.assertEqual(set(signals), set(frames))
+        for strategy in signals["CLOSE"].reasoning.values():
+            self.assertNotIn("error", strategy["metrics"])
+        # Only the high/low based indicators fall back to their defaults
+        self.assertEqual(signals["CLOSE"].reasoning["trend_following"]["metrics"]["adx"], 25.0)
+        self.assertEqual(
+            signals["CLOSE"].reasoning["mean_reversion"]["metrics"],
+            signals["FULL"].reasoning["mean_reversion"]["metrics"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
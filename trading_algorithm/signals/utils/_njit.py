@@ -0,0 +1,36 @@
+# signals/utils/_njit.py
+"""
+Optional Numba support shared by the compiled kernels.
+
+Numba is not a hard dependency: without it ``njit`` hands the function back
+unchanged and ``prange`` is plain ``range``, so every kernel still runs as
+ordinary Python.
+"""
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit, used both bare (@njit) and with options (@njit(cache=True))."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def warm_up(kernel, *args) -> None:
+    """
+    Compile (or load from Numba's on-disk cache) a kernel at import time.
+
+    Without this the first real call, usually inside an analyze() run, pays
+    the compilation cost. Does nothing when Numba is not installed.
+
+    Args:
+        kernel: The @njit function to compile
+        *args: Sample arguments with the types the kernel is called with
+    """
+    if HAS_NUMBA:
+        kernel(*args)
@@ -0,0 +1,80 @@
+# signals/utils/cache.py
+import hashlib
+import orjson
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class FileCache:
+    """
+    JSON file cache with per-lookup TTL for small API payloads.
+
+    Each entry lives at <root>/<endpoint>/<md5(params)>.json as
+    {"ts": epoch_seconds, "data": payload}.
+    """
+
+    def __init__(self, root: str = ".cache/alpaca"):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Directory holding one subdirectory per endpoint
+        """
+        self.root = Path(root)
+
+    def _path(self, endpoint: str, params: Dict[str, Any]) -> Path:
+        """File path for an (endpoint, params) key."""
+        key = hashlib.md5(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return self.root / endpoint / f"{key}.json"
+
+    def get(self, endpoint: str, params: Dict[str, Any], ttl: float) -> Optional[Any]:
+        """
+        Get a cached payload if it is younger than ttl.
+
+        Args:
+            endpoint: Endpoint name
+            params: Request parameters the payload was fetched with
+            ttl: Maximum age in seconds (0 disables the cache)
+
+        Returns:
+            The cached payload, or None on a miss or expired entry
+        """
+        if ttl <= 0:
+            return None
+
+        path = self._path(endpoint, params)
+        try:
+            with open(path, 'rb') as f:
+                record = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Failed to load from file cache: {e}")
+            return None
+
+        if time.time() - record.get("ts", 0) < ttl:
+            return record.get("data")
+        return None
+
+    def set(self, endpoint: str, params: Dict[str, Any], data: Any):
+        """
+        Store a payload for an (endpoint, params) key.
+
+        Args:
+            endpoint: Endpoint name
+            params: Request parameters the payload was fetched with
+            data: JSON-serializable payload
+        """
+        path = self._path(endpoint, params)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps({"ts": time.time(), "data": data}))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Failed to save to file cache: {e}")
@@ -0,0 +1,36 @@
+# signals/utils/http.py
+import aiohttp
+import orjson
+from typing import Optional
+
+# One connection pool and DNS cache for every aiohttp client in the process
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Get the process-wide aiohttp session, creating it on first use.
+
+    Created lazily so it binds to the running event loop. Callers pass their
+    own auth headers per request and must not close it; call close_session()
+    once at shutdown.
+
+    Returns:
+        aiohttp.ClientSession: The shared session
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=15),
+            json_serialize=lambda obj: orjson.dumps(obj).decode()
+        )
+    return _session
+
+
+async def close_session():
+    """Close the process-wide aiohttp session if it is open."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -1,18 +1,95 @@
 # mixgo/utils/llm.py (updated version)
 import json
+import orjson
 import asyncio
-import re
+import random
+from functools import lru_cache
 from typing import TypeVar, Type, Optional, Any, List, Dict
 from pydantic import BaseModel
 import os
 
-# Import necessary libraries
-import openai
-import anthropic
-from langchain_groq import ChatGroq
+# Provider SDKs (openai, anthropic, langchain_groq) are imported on first use in
+# _get_client: langchain_groq alone adds a noticeable import cost, and a run only
+# ever talks to one provider
 
 T = TypeVar('T', bound=BaseModel)
 
+# Read once; this module is imported lazily, after the entry points load .env
+_GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Provider clients, reused across calls so their HTTP connections stay open
+_CLIENTS: Dict[tuple, Any] = {}
+
+def _http_client():
+    """httpx client for the provider SDKs, with a pool sized for concurrent agents."""
+    import httpx
+    return httpx.AsyncClient(limits=httpx.Limits(max_connections=64, max_keepalive_connections=16))
+
+def _get_client(provider: str, model_name: Optional[str] = None, json_mode: bool = False):
+    """
+    Get the cached client for a provider, creating it on first use.
+    
+    Args:
+        provider: "groq", "openai" or "anthropic"
+        model_name: Model name (Groq clients are bound to a model)
+        json_mode: Bind Groq's JSON mode into the client
+        
+    Returns:
+        The provider's async-capable client
+    """
+    key = (provider, model_name, json_mode)
+    client = _CLIENTS.get(key)
+    if client is None:
+        if provider == "groq":
+            from langchain_groq import ChatGroq
+            client = ChatGroq(api_key=_GROQ_API_KEY, model=model_name or "llama-3.3-70b-versatile")
+            if json_mode:
+                client = client.bind(response_format={"type": "json_object"})
+        elif provider == "openai":
+            import openai
+            client = openai.AsyncOpenAI(http_client=_http_client())
+        elif provider == "anthropic":
+            import anthropic
+            client = anthropic.AsyncAnthropic(http_client=_http_client())
+        else:
+            raise ValueError(f"Unsupported model provider: {provider}")
+        client = _CLIENTS.setdefault(key, client)
+    return client
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the first JSON object from LLM output.
+    
+    Clean JSON goes straight through orjson; otherwise (code fences, prose
+    around the object) each '{' is tried as the start of a balanced object,
+    which raw_decode finds in one C-level pass.
+    
+    Args:
+        text: Raw LLM output
+        
+    Returns:
+        dict: The first JSON object found, or None
+    """
+    try:
+        parsed = orjson.loads(text)
+        if isinstance(parsed, dict):
+            return parsed
+    except orjson.JSONDecodeError:
+        pass
+    
+    start = text.find("{")
+    while start != -1:
+        try:
+            parsed, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+        start = text.find("{", start + 1)
+    return None
+
 async def call_llm(
     prompt: List[Dict[str, str]],
     model_name: str,
@@ -21,26 +98,46 @@ async def call_llm(
     agent_name: Optional[str] = None,
     max_retries: int = 3,
     default_factory = None,
-    verbose: bool = False
+    verbose: bool = False,
+    response_format: Optional[Dict[str, Any]] = None,
+    stream: bool = True
 ) -> T:
     """
     Makes an asynchronous LLM call with retry logic.
+    
+    response_format is an OpenAI-style structured-output spec, by default a
+    json_schema built from pydantic_model; providers then constrain decoding
+    to that schema (Anthropic through a forced tool call) and the JSON repair
+    below only runs when a provider still returns free text.
+    
+    With stream=True the completion is streamed and generation is stopped as
+    soon as a JSON object holding every required field of pydantic_model has
+    arrived, so a trailing explanation after the JSON isn't waited for.
     """
     from signals.utils.progress import progress
     
+    required_keys = frozenset(name for name, field in pydantic_model.model_fields.items() if field.is_required())
+    
+    # Constrain decoding to the model's schema unless the caller chose a format
+    if response_format is None:
+        from signals.llm.client import json_schema_format
+        response_format = json_schema_format(pydantic_model)
+    
     # Call the LLM with retries
-    for attempt in range(max_retries):
+    attempt = 0
+    timeout_retried = False
+    while attempt < max_retries:
         try:
             if agent_name:
                 progress.update_status(agent_name, None, f"Calling LLM (attempt {attempt+1}/{max_retries})")
             
             # Call appropriate LLM based on provider
             if model_provider.lower() == "groq":
-                result = await _call_groq(prompt, model_name)
+                result = await _call_groq(prompt, model_name, response_format, stream, required_keys)
             elif model_provider.lower() == "openai":
-                result = await _call_openai(prompt, model_name)
+                result = await _call_openai(prompt, model_name, response_format, stream, required_keys)
             elif model_provider.lower() == "anthropic":
-                result = await _call_anthropic(prompt, model_name)
+                result = await _call_anthropic(prompt, model_name, stream, required_keys, response_format)
             else:
                 raise ValueError(f"Unsupported model provider: {model_provider}")
             
@@ -54,77 +151,25 @@ async def call_llm(
                     print(f"DEBUG - LLM response for {agent_name}: {result}")
                 
                 try:
-                    # If response is a string, try to extract JSON from it
+                    # If response is a string, extract the first JSON object from it
                     if isinstance(result, str):
-                        # Look for JSON code blocks first
-                        if "```json" in result:
-                            json_content = result.split("```json")[1].split("```")[0]
-                            try:
-                                result = json.loads(json_content.strip())
-                            except:
-                                print("Failed to parse JSON code block")
-                        # Try to parse as direct JSON
-                        elif result.strip().startswith('{'):
-                            try:
-                                result = json.loads(result.strip())
-                            except:
-                                print("Failed to parse direct JSON")
+                        result = _extract_json(result) or result
                     
                     # If result is still not a dict, create default structure
                     if not isinstance(result, dict):
                         result = {"action": "hold", "quantity": 0, "confidence": 50.0, "reasoning": str(result)}
                     
-                    # CRITICAL: Try to extract JSON object from reasoning field if it contains code blocks
-                    if isinstance(result, dict) and "reasoning" in result:
-                        reasoning = result.get("reasoning", "")
-                        
-                        # Look for JSON in the reasoning field - this is the key fix!
-                        if "```" in reasoning:
-                            # Find JSON between triple backticks
-                            parts = reasoning.split("```")
-                            for part in parts:
-                                part = part.strip()
-                                # Remove 'json' language identifier if present
-                                if part.startswith('json\n'):
-                                    part = part[5:].strip()
-                                elif part.startswith('json '):
-                                    part = part[5:].strip()
-                                    
-                                # Try to parse as JSON
-                                if part.startswith('{') and part.endswith('}'):
-                                    try:
-                                        embedded_json = json.loads(part)
-                                        print(f"Found embedded JSON: {embedded_json}")
-                                        # Use the embedded JSON values - they override everything
-                                        if "action" in embedded_json:
-                                            result["action"] = embedded_json["action"]
-                                        if "quantity" in embedded_json:
-                                            result["quantity"] = embedded_json["quantity"]
-                                        if "confidence" in embedded_json:
-                                            result["confidence"] = embedded_json["confidence"]
-                                        if "reasoning" in embedded_json:
-                                            result["reasoning"] = embedded_json["reasoning"]
-                                        break  # Stop after finding the first valid JSON
-                                    except Exception as parse_error:
-                                        print(f"Failed to parse JSON block: {parse_error}")
-                                        continue
-                        
-                        # Also try direct JSON parsing if reasoning starts with {
-                        elif reasoning.strip().startswith('{'):
-                            try:
-                                embedded_json = json.loads(reasoning.strip())
-                                print(f"Found direct JSON in reasoning: {embedded_json}")
-                                # Use the embedded JSON values
-                                if "action" in embedded_json:
-                                    result["action"] = embedded_json["action"]
-                                if "quantity" in embedded_json:
-                                    result["quantity"] = embedded_json["quantity"]
-                                if "confidence" in embedded_json:
-                                    result["confidence"] = embedded_json["confidence"]
-                                if "reasoning" in embedded_json:
-                                    result["reasoning"] = embedded_json["reasoning"]
-                            except Exception as parse_error:
-                                print(f"Failed to parse direct JSON in reasoning: {parse_error}")
+                    # Models sometimes nest their real answer as JSON inside the reasoning
+                    # text, fenced or as the whole field; those values override everything.
+                    # Plain prose that merely contains a brace isn't scanned
+                    reasoning = result.get("reasoning")
+                    if isinstance(reasoning, str) and (reasoning.find("```") != -1 or reasoning.lstrip().startswith("{")):
+                        embedded_json = _extract_json(reasoning)
+                        if embedded_json:
+                            print(f"Found embedded JSON: {embedded_json}")
+                            for key in ("action", "quantity", "confidence", "reasoning"):
+                                if key in embedded_json:
+                                    result[key] = embedded_json[key]
                     
                     # Ensure all required fields are present with proper types
                     if "action" not in result or not result["action"]:
@@ -159,37 +204,93 @@ async def call_llm(
                 progress.update_status(agent_name, None, f"Error in LLM call: {type(e).__name__}")
             
             print(f"LLM call attempt {attempt+1} failed: {e}")
-            await asyncio.sleep(1)  # Wait before retry
+            
+            # A single timeout is retried straight away without using up an attempt
+            if _is_timeout(e) and not timeout_retried:
+                timeout_retried = True
+                continue
             
             if attempt == max_retries - 1:
                 print(f"All LLM call attempts failed. Using default response.")
                 if default_factory:
                     return default_factory()
                 return _create_default_response(pydantic_model)
+            
+            await asyncio.sleep(_retry_delay(e, attempt))
+        
+        attempt += 1
     
     # Fallback - should not reach here but just in case
     if default_factory:
         return default_factory()
     return _create_default_response(pydantic_model)
 
-async def _call_groq(messages, model_name):
+def _is_timeout(error: Exception) -> bool:
+    """Whether an LLM call failed by timing out (asyncio, httpx or provider SDK timeouts)."""
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "Timeout" in type(error).__name__
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed LLM call.
+    
+    Rate-limit errors carrying a Retry-After header wait as long as the provider
+    asks; everything else backs off exponentially with jitter so concurrent
+    agents don't retry in lockstep.
+    
+    Args:
+        error: Exception from the failed call
+        attempt: Zero-based attempt number
+        
+    Returns:
+        float: Delay in seconds
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if getattr(error, "status_code", None) == 429 and headers is not None:
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    return min(8.0, 0.25 * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+def _complete_json(buffer: str, required_keys: frozenset) -> Optional[Dict[str, Any]]:
+    """Return the JSON object in a partial streamed response once it holds every required key."""
+    parsed = _extract_json(buffer)
+    if parsed is not None and required_keys <= parsed.keys():
+        return parsed
+    return None
+
+async def _call_groq(messages, model_name, response_format=None, stream=False, required_keys=frozenset()):
     """Call Groq API."""
     try:
-        api_key = os.getenv("GROQ_API_KEY")
+        api_key = _GROQ_API_KEY
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
-        # ChatGroq in LangChain has a different interface than we expected
-        client = ChatGroq(
-            api_key=api_key,
-            model=model_name or "llama-3.3-70b-versatile"
-        )
+        # JSON mode guarantees parseable output; Groq's json_schema support
+        # is limited to a few models, so the schema itself isn't forwarded
+        client = _get_client("groq", model_name, json_mode=bool(response_format))
         
         # Convert the messages to the expected format
         formatted_messages = []
         for msg in messages:
             formatted_messages.append({"role": msg["role"], "content": msg["content"]})
         
+        if stream:
+            buffer = ""
+            chunks = client.astream(formatted_messages)
+            try:
+                async for chunk in chunks:
+                    buffer += chunk.content
+                    # Only a closing brace can complete the object
+                    if "}" in chunk.content:
+                        parsed = _complete_json(buffer, required_keys)
+                        if parsed is not None:
+                            return parsed
+            finally:
+                # Closing the generator drops the connection and stops generation
+                await chunks.aclose()
+            return buffer
+        
         # Use ainvoke method for async call
         response = await client.ainvoke(formatted_messages)
         
@@ -204,20 +305,39 @@ async def _call_groq(messages, model_name):
         print(f"Groq API error: {e}")
         raise
 
-async def _call_openai(messages, model_name):
+async def _call_openai(messages, model_name, response_format=None, stream=False, required_keys=frozenset()):
     """Call OpenAI API."""
     try:
-        response = await openai.chat.completions.create(
+        response = await _get_client("openai").chat.completions.create(
             model=model_name,
             messages=[{"role": msg["role"], "content": msg["content"]} for msg in messages],
-            response_format={"type": "json_object"}
+            response_format=response_format or {"type": "json_object"},
+            stream=stream
         )
-        return json.loads(response.choices[0].message.content)
+        if not stream:
+            return orjson.loads(response.choices[0].message.content)
+        
+        buffer = ""
+        try:
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                buffer += delta
+                # Only a closing brace can complete the object
+                if "}" in delta:
+                    parsed = _complete_json(buffer, required_keys)
+                    if parsed is not None:
+                        return parsed
+        finally:
+            # Closing the stream drops the connection and stops generation
+            await response.close()
+        return buffer
     except Exception as e:
         print(f"OpenAI API error: {e}")
         raise
 
-async def _call_anthropic(messages, model_name):
+async def _call_anthropic(messages, model_name, stream=False, required_keys=frozenset(), response_format=None):
     """Call Anthropic API."""
     try:
         # Convert the messages format to Anthropic's format
@@ -229,19 +349,55 @@ async def _call_anthropic(messages, model_name):
             elif msg["role"] == "assistant":
                 content.append({"type": "text", "text": msg["content"]})
         
-        response = await anthropic.messages.create(
-            model=model_name,
-            system=system,
-            messages=content,
-            max_tokens=1000,
-        )
-        return json.loads(response.content[0].text)
+        request = {
+            "model": model_name,
+            "messages": [{"role": "user", "content": content}],
+            "max_tokens": 1000,
+        }
+        if system:
+            # Mark the static system prompt as a cacheable prefix
+            request["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        
+        client = _get_client("anthropic")
+        
+        # Anthropic's structured output is a forced tool call: the model must fill
+        # the tool's input schema, so the answer arrives as an already-parsed dict
+        # with no prose around it to stream past
+        schema = (response_format or {}).get("json_schema", {}).get("schema")
+        if schema:
+            response = await client.messages.create(
+                **request,
+                tools=[{"name": "emit_decision", "description": "Record the decision.", "input_schema": schema}],
+                tool_choice={"type": "tool", "name": "emit_decision"},
+            )
+            return next(block.input for block in response.content if block.type == "tool_use")
+        
+        if stream:
+            buffer = ""
+            # Leaving the context manager closes the stream and stops generation
+            async with client.messages.stream(**request) as response:
+                async for text in response.text_stream:
+                    buffer += text
+                    # Only a closing brace can complete the object
+                    if "}" in text:
+                        parsed = _complete_json(buffer, required_keys)
+                        if parsed is not None:
+                            return parsed
+            return buffer
+        
+        response = await client.messages.create(**request)
+        return orjson.loads(response.content[0].text)
     except Exception as e:
         print(f"Anthropic API error: {e}")
         raise
 
 def _create_default_response(model_class: Type[T]) -> T:
     """Creates a safe default response based on the model's fields."""
+    return model_class(**_default_values_for(model_class))
+
+@lru_cache(maxsize=32)
+def _default_values_for(model_class: Type[BaseModel]) -> Dict[str, Any]:
+    """Field defaults for _create_default_response, introspected once per model class."""
     default_values = {}
     for field_name, field in model_class.model_fields.items():
         if field.annotation == str:
@@ -259,4 +415,4 @@ def _create_default_response(model_class: Type[T]) -> T:
             else:
                 default_values[field_name] = None
     
-    return model_class(**default_values)
\ No newline at end of file
+    return default_values
\ No newline at end of file
@@ -14,15 +14,17 @@ for path in sys.path:
         pass
     print(f"  {path}")
 
-# Print the current directory structure
-print("\nCurrent directory structure:")
-for root, dirs, files in os.walk(project_root):
-    level = root.replace(project_root, '').count(os.sep)
-    indent = ' ' * 4 * level
-    print(f"{indent}{os.path.basename(root)}/")
-    subindent = ' ' * 4 * (level + 1)
-    for f in files:
-        print(f"{subindent}{f}")
+# Print the current directory structure (opt-in, it walks the whole tree)
+if os.environ.get("MIXGO_DEBUG_TREE") == "1":
+    lines = ["\nCurrent directory structure:"]
+    for root, dirs, files in os.walk(project_root):
+        rel = os.path.relpath(root, project_root)
+        level = 0 if rel == os.curdir else rel.count(os.sep) + 1
+        indent = ' ' * 4 * level
+        lines.append(f"{indent}{os.path.basename(root)}/")
+        subindent = ' ' * 4 * (level + 1)
+        lines.extend(f"{subindent}{f}" for f in files)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # Try importing a simple module
 print("\nTrying to import a module...")
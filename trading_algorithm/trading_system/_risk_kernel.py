@@ -0,0 +1,185 @@
+# trading_system/_risk_kernel.py
+"""
+Scalar Kelly and position-sizing math for the RiskManager.
+
+Kept apart from the Polars code so the arithmetic can be compiled with Numba
+when it is installed; without Numba the functions run as plain Python.
+"""
+from typing import Tuple
+
+from signals.utils._njit import njit, warm_up
+
+
+@njit(cache=True)
+def kelly_fraction(
+    height: int,
+    n_returns: int,
+    n_wins: int,
+    n_losses: int,
+    avg_win: float,
+    avg_loss: float,
+    volatility: float,
+    min_bars: int
+) -> float:
+    """
+    Kelly Criterion fraction from daily return statistics.
+
+    Kelly Formula: f = (bp - q) / b, with b the average win / average loss
+    ratio and p the share of winning days. Capped at 20% and halved for
+    high-volatility stocks.
+
+    Args:
+        height: Number of price bars
+        n_returns: Number of daily returns
+        n_wins: Number of positive returns
+        n_losses: Number of negative returns
+        avg_win: Mean positive return (NaN when there are none)
+        avg_loss: Mean negative return (NaN when there are none)
+        volatility: Annualized volatility
+        min_bars: Bars needed before the default is replaced
+
+    Returns:
+        float: Kelly fraction, or the conservative 2% default
+    """
+    if height < min_bars or n_returns < 10:
+        return 0.02  # Conservative default for insufficient data
+
+    if n_wins == 0 or n_losses == 0:
+        return 0.02
+
+    win_probability = n_wins / n_returns
+    avg_loss = abs(avg_loss)
+    if avg_loss == 0 or avg_win == 0:
+        return 0.02  # Avoid division by zero
+
+    win_loss_ratio = avg_win / avg_loss  # b in Kelly formula
+    fraction = (win_probability * win_loss_ratio - (1 - win_probability)) / win_loss_ratio
+    fraction = 0.20 if fraction > 0.20 else fraction  # Cap at 20%
+    fraction = fraction if fraction > 0.0 else 0.0
+
+    # High volatility stocks get lower Kelly
+    if volatility > 0.5:
+        fraction = fraction * 0.5
+
+    return fraction
+
+
+@njit(cache=True)
+def position_sizing(
+    current_price: float,
+    volatility: float,
+    atr: float,
+    kelly: float,
+    portfolio_value: float,
+    kelly_multiplier: float,
+    max_position_pct: float,
+    max_risk_per_trade: float
+) -> Tuple[float, float, int, int, int, int, float, float, float, float, float, float]:
+    """
+    Position size limits, stop loss and confidence for one ticker.
+
+    Zero or missing inputs fall back to the same defaults the RiskManager has
+    always used (100 price, 15% volatility, 2%-of-price ATR, 2% Kelly).
+
+    Returns:
+        tuple: (kelly_adjusted, max_position_value, max_shares_kelly,
+        max_shares_risk, max_shares_concentration, recommended_shares,
+        stop_loss_price, stop_loss_pct, risk_per_share, position_risk_pct,
+        portfolio_exposure_pct, confidence)
+    """
+    # Validate inputs; zero counts as missing. Bounds are written as ternaries
+    # (same results as max/min, including for NaN) so they compile to maxsd/minsd
+    current_price = current_price if current_price != 0 else 100.0
+    current_price = current_price if current_price > 0.01 else 0.01
+    volatility = volatility if volatility != 0 else 0.15
+    volatility = volatility if volatility > 0.01 else 0.01
+    atr = atr if atr != 0 else current_price * 0.02
+    atr = atr if atr > 0.01 else 0.01
+    kelly = kelly if kelly != 0 else 0.02
+    kelly = 1.0 if 1.0 < kelly else kelly
+    kelly = kelly if kelly > 0.0 else 0.0
+    portfolio_value = portfolio_value if portfolio_value != 0 else 10000.0
+    portfolio_value = portfolio_value if portfolio_value > 1000.0 else 1000.0
+
+    # 1. Kelly-based position sizing (conservative)
+    kelly_adjusted = kelly * kelly_multiplier
+    kelly_position_value = portfolio_value * kelly_adjusted
+    max_shares_kelly = int(kelly_position_value / current_price)
+
+    # 2. Risk-based position sizing: 2x ATR or 2% of price per share
+    risk_per_share = atr * 2.0
+    risk_per_share = current_price * 0.02 if current_price * 0.02 > risk_per_share else risk_per_share
+    max_risk_value = portfolio_value * max_risk_per_trade
+    max_shares_risk = int(max_risk_value / risk_per_share)
+
+    # 3. Concentration limit (max position size)
+    max_position_value = portfolio_value * max_position_pct
+    max_shares_concentration = int(max_position_value / current_price)
+
+    # 4. Take the most conservative constraint
+    recommended_shares = max_shares_risk if max_shares_risk < max_shares_kelly else max_shares_kelly
+    recommended_shares = max_shares_concentration if max_shares_concentration < recommended_shares else recommended_shares
+    recommended_shares = recommended_shares if recommended_shares > 0 else 0
+
+    # 5. Stop loss at 2-8% based on volatility
+    stop_loss_pct = volatility * 1.5
+    stop_loss_pct = stop_loss_pct if stop_loss_pct > 0.02 else 0.02
+    stop_loss_pct = stop_loss_pct if stop_loss_pct < 0.08 else 0.08
+    stop_loss_price = current_price * (1 - stop_loss_pct)
+
+    # 6. Position risk metrics
+    position_value = recommended_shares * current_price
+    position_risk = recommended_shares * risk_per_share
+    position_risk_pct = position_risk / portfolio_value
+    portfolio_exposure_pct = position_value / portfolio_value
+
+    # 7. Confidence from data quality and risk constraints
+    data_quality_score = kelly * 2  # Higher Kelly = better data
+    data_quality_score = data_quality_score if data_quality_score < 1.0 else 1.0
+    constraint_score = 1.0 if recommended_shares > 0 else 0.3
+    confidence = 30.0 + (data_quality_score * constraint_score * 65.0)
+    confidence = confidence if confidence < 95.0 else 95.0
+
+    return (
+        kelly_adjusted,
+        max_position_value,
+        max_shares_kelly,
+        max_shares_risk,
+        max_shares_concentration,
+        recommended_shares,
+        stop_loss_price,
+        stop_loss_pct,
+        risk_per_share,
+        position_risk_pct,
+        portfolio_exposure_pct,
+        confidence
+    )
+
+
+def make_position_sizer(kelly_multiplier: float, max_position_pct: float, max_risk_per_trade: float):
+    """
+    Specialize position_sizing for one set of risk limits.
+
+    The limits are captured as compile-time constants, so callers pass only the
+    per-ticker inputs: sizer(current_price, volatility, atr, kelly, portfolio_value).
+
+    Args:
+        kelly_multiplier: Fraction of full Kelly to use
+        max_position_pct: Maximum position size as a fraction of the portfolio
+        max_risk_per_trade: Maximum risk per trade as a fraction of the portfolio
+
+    Returns:
+        callable: The specialized sizer, returning the same tuple as position_sizing
+    """
+    @njit
+    def sizer(current_price, volatility, atr, kelly, portfolio_value):
+        return position_sizing(
+            current_price, volatility, atr, kelly, portfolio_value,
+            kelly_multiplier, max_position_pct, max_risk_per_trade
+        )
+
+    return sizer
+
+
+warm_up(kelly_fraction, 60, 59, 30, 29, 0.01, -0.01, 0.2, 30)
+warm_up(position_sizing, 100.0, 0.2, 2.0, 0.05, 100000.0, 0.25, 0.05, 0.02)
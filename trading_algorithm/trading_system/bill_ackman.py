@@ -1,6 +1,123 @@
+import math
+import numpy as np
+import requests
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from typing import Dict, List, Any
 from signals.data.models import AnalystSignal
 from signals.utils.progress import progress
+from signals.utils._njit import njit, prange
+
+
+@dataclass
+class _LineArrays:
+    """Line-item series for one ticker, one float array per attribute with NaN for missing values."""
+    revenue: np.ndarray
+    op_margin: np.ndarray
+    fcf: np.ndarray
+    debt_to_equity: np.ndarray
+    liab: np.ndarray
+    assets: np.ndarray
+    dividends: np.ndarray
+    shares: np.ndarray
+    
+    @classmethod
+    def from_line_items(cls, financial_line_items) -> "_LineArrays":
+        """Extract every attribute in a single pass over the line items."""
+        rows = [
+            (
+                item.revenue,
+                item.operating_margin,
+                item.free_cash_flow,
+                item.debt_to_equity,
+                item.total_liabilities,
+                item.total_assets,
+                item.dividends_and_other_cash_distributions,
+                item.outstanding_shares,
+            )
+            for item in financial_line_items
+        ]
+        # None becomes NaN under a float dtype; reshape keeps 8 columns when there are no rows
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 8).T
+        return cls(*columns)
+    
+    def __len__(self) -> int:
+        return len(self.revenue)
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    """Drop missing (NaN) entries from a line-item series."""
+    return values[~np.isnan(values)]
+
+
+def _latest_fcf(arrays: _LineArrays) -> float:
+    """Most recent free cash flow, or 0 when it is missing or zero."""
+    if not len(arrays) or np.isnan(arrays.fcf[0]) or arrays.fcf[0] == 0:
+        return 0
+    return float(arrays.fcf[0])
+
+
+# Basic DCF assumptions
+_GROWTH_RATE = 0.06
+_DISCOUNT_RATE = 0.10
+_TERMINAL_MULTIPLE = 15
+_PROJECTION_YEARS = 5
+
+
+@njit(cache=True)
+def _dcf_intrinsic_value(fcf, growth_rate: float, discount_rate: float, terminal_multiple: float, projection_years: int):
+    """
+    Intrinsic value from a growing-FCF DCF plus an exit-multiple terminal value.
+    
+    The discounted projections form a geometric series, so they are summed in
+    closed form. fcf may be a scalar or an array of FCFs (one per ticker), in
+    which case the result is an array of intrinsic values.
+    
+    Args:
+        fcf: Latest free cash flow(s)
+        growth_rate: Annual FCF growth rate
+        discount_rate: Annual discount rate
+        terminal_multiple: FCF multiple applied in the final projected year
+        projection_years: Number of projected years
+        
+    Returns:
+        Intrinsic value(s), same shape as fcf
+    """
+    # ratio = (1 + g) / (1 + r); excess = ratio - 1, computed without cancellation
+    excess = (growth_rate - discount_rate) / (1 + discount_rate)
+    ratio = 1 + excess
+    growth_factor = ratio ** projection_years
+    
+    # sum of ratio**t for t = 1..projection_years
+    if excess == 0:
+        series_sum = projection_years
+    else:
+        series_sum = ratio * math.expm1(projection_years * math.log1p(excess)) / excess
+    
+    return fcf * (series_sum + growth_factor * terminal_multiple)
+
+
+@njit(parallel=True, cache=True)
+def _dcf_batch(fcf: np.ndarray, growth_rate: float, discount_rate: float, terminal_multiple: float, projection_years: int) -> np.ndarray:
+    """
+    Intrinsic values for many tickers at once, e.g. when backtesting over rolling dates.
+    
+    Args:
+        fcf: Latest free cash flow per ticker
+        growth_rate: Annual FCF growth rate
+        discount_rate: Annual discount rate
+        terminal_multiple: FCF multiple applied in the final projected year
+        projection_years: Number of projected years
+        
+    Returns:
+        np.ndarray: Intrinsic value per ticker
+    """
+    values = np.empty(fcf.shape[0], dtype=np.float64)
+    for i in prange(fcf.shape[0]):
+        values[i] = _dcf_intrinsic_value(fcf[i], growth_rate, discount_rate, terminal_multiple, projection_years)
+    return values
+
 
 class BillAckmanAgent:
     """
@@ -13,87 +130,121 @@ class BillAckmanAgent:
     
     def __init__(self):
         self.name = "bill_ackman"
+        self._agent_label = f"{self.name}_agent"
     
     def analyze(self, tickers: List[str], data_fetcher, end_date, start_date=None) -> Dict[str, AnalystSignal]:
         """Generate signals for multiple tickers based on Ackman's principles."""
-        signals = {}
-        
-        for ticker in tickers:
-            progress.update_status(f"{self.name}_agent", ticker, "Fetching financial metrics")
-            
-            # Fetch required data
-            metrics = data_fetcher.get_financial_metrics(ticker, end_date)
-            financial_line_items = data_fetcher.get_line_items(
-                ticker, 
-                end_date, 
-                line_items=[
-                    "revenue",
-                    "operating_margin",
-                    "debt_to_equity",
-                    "free_cash_flow",
-                    "total_assets",
-                    "total_liabilities",
-                    "dividends_and_other_cash_distributions",
-                    "outstanding_shares",
-                ]
-            )
-            market_cap = data_fetcher.get_market_cap(ticker, end_date)
-            
-            # Analyze business quality
-            progress.update_status(f"{self.name}_agent", ticker, "Analyzing business quality")
-            quality_analysis = self._analyze_business_quality(metrics, financial_line_items)
-            
-            # Analyze financial discipline and balance sheet
-            progress.update_status(f"{self.name}_agent", ticker, "Analyzing balance sheet and capital structure")
-            balance_sheet_analysis = self._analyze_financial_discipline(metrics, financial_line_items)
-            
-            # Analyze activism potential
-            progress.update_status(f"{self.name}_agent", ticker, "Analyzing activism potential")
-            activism_analysis = self._analyze_activism_potential(financial_line_items)
-            
-            # Analyze valuation
-            progress.update_status(f"{self.name}_agent", ticker, "Calculating intrinsic value & margin of safety")
-            valuation_analysis = self._analyze_valuation(financial_line_items, market_cap)
-            
-            # Combine sub-analyses with weights
-            total_score = (
-                quality_analysis["score"] * 0.30 +
-                balance_sheet_analysis["score"] * 0.25 +
-                activism_analysis["score"] * 0.25 +
-                valuation_analysis["score"] * 0.20
-            )
-            
-            # Generate signal based on total score
-            if total_score >= 7.5:
-                signal = "bullish"
-                confidence = min(90, 50 + (total_score - 7.5) * 10)
-            elif total_score <= 4.5:
-                signal = "bearish"
-                confidence = min(90, 50 + (4.5 - total_score) * 10)
-            else:
-                signal = "neutral" 
-                confidence = 50
-                
-            # Create reasoning structure
-            reasoning = {
-                "business_quality": quality_analysis,
-                "financial_discipline": balance_sheet_analysis,
-                "activism_potential": activism_analysis,
-                "valuation": valuation_analysis,
-                "total_score": total_score
+        # Each ticker spends most of its time waiting on data requests, so
+        # the fetches run concurrently
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                executor.submit(self._fetch_ticker_data, ticker, data_fetcher, end_date): ticker
+                for ticker in tickers
             }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    fetched[ticker] = future.result()
+                except (requests.RequestException, KeyError, TimeoutError) as e:
+                    warnings.warn(f"{self.name}: skipping {ticker}: {e}")
+        
+        # Keep the caller's ticker order
+        scored = [ticker for ticker in tickers if ticker in fetched]
+        
+        # Value every ticker in one DCF batch; _analyze_valuation only uses
+        # the values for tickers with positive FCF
+        latest_fcf = np.array([_latest_fcf(fetched[ticker][1]) for ticker in scored], dtype=np.float64)
+        intrinsic_values = _dcf_batch(latest_fcf, _GROWTH_RATE, _DISCOUNT_RATE, _TERMINAL_MULTIPLE, _PROJECTION_YEARS)
+        
+        return {
+            ticker: self._score_ticker(ticker, *fetched[ticker], intrinsic_value=float(intrinsic_value))
+            for ticker, intrinsic_value in zip(scored, intrinsic_values)
+        }
+    
+    def _fetch_ticker_data(self, ticker: str, data_fetcher, end_date):
+        """
+        Fetch the data Ackman's analysis needs for one ticker.
+        
+        Returns:
+            tuple: (metrics, line-item arrays, market cap)
+        """
+        progress.update_status(self._agent_label, ticker, "Fetching financial metrics")
+        
+        # Fetch required data
+        metrics = data_fetcher.get_financial_metrics(ticker, end_date)
+        financial_line_items = data_fetcher.get_line_items(
+            ticker, 
+            end_date, 
+            line_items=[
+                "revenue",
+                "operating_margin",
+                "debt_to_equity",
+                "free_cash_flow",
+                "total_assets",
+                "total_liabilities",
+                "dividends_and_other_cash_distributions",
+                "outstanding_shares",
+            ]
+        )
+        market_cap = data_fetcher.get_market_cap(ticker, end_date)
+        
+        return metrics, _LineArrays.from_line_items(financial_line_items), market_cap
+    
+    def _score_ticker(self, ticker: str, metrics, arrays: _LineArrays, market_cap, intrinsic_value: float = None) -> AnalystSignal:
+        """Score one ticker's fetched data on Ackman's principles."""
+        # The sub-analyses take microseconds, so report them as one step
+        progress.update_status(self._agent_label, ticker, "Analyzing")
+        
+        # Analyze business quality
+        quality_analysis = self._analyze_business_quality(metrics, arrays)
+        
+        # Analyze financial discipline and balance sheet
+        balance_sheet_analysis = self._analyze_financial_discipline(metrics, arrays)
+        
+        # Analyze activism potential
+        activism_analysis = self._analyze_activism_potential(arrays)
+        
+        # Analyze valuation
+        valuation_analysis = self._analyze_valuation(arrays, market_cap, intrinsic_value)
+        
+        # Combine sub-analyses with weights
+        total_score = (
+            quality_analysis["score"] * 0.30 +
+            balance_sheet_analysis["score"] * 0.25 +
+            activism_analysis["score"] * 0.25 +
+            valuation_analysis["score"] * 0.20
+        )
+        
+        # Generate signal based on total score
+        if total_score >= 7.5:
+            signal = "bullish"
+            confidence = min(90, 50 + (total_score - 7.5) * 10)
+        elif total_score <= 4.5:
+            signal = "bearish"
+            confidence = min(90, 50 + (4.5 - total_score) * 10)
+        else:
+            signal = "neutral" 
+            confidence = 50
             
-            signals[ticker] = AnalystSignal(
-                signal=signal,
-                confidence=confidence,
-                reasoning=reasoning
-            )
-            
-            progress.update_status(f"{self.name}_agent", ticker, "Done")
-            
-        return signals
+        # Create reasoning structure
+        reasoning = {
+            "business_quality": quality_analysis,
+            "financial_discipline": balance_sheet_analysis,
+            "activism_potential": activism_analysis,
+            "valuation": valuation_analysis,
+            "total_score": total_score
+        }
+        
+        progress.update_status(self._agent_label, ticker, "Done")
+        
+        return AnalystSignal(
+            signal=signal,
+            confidence=confidence,
+            reasoning=reasoning
+        )
     
-    def _analyze_business_quality(self, metrics, financial_line_items):
+    def _analyze_business_quality(self, metrics, arrays: _LineArrays):
         """
         Analyze whether the company has a high-quality business with stable or growing cash flows,
         durable competitive advantages (moats), and potential for long-term growth.
@@ -101,14 +252,17 @@ class BillAckmanAgent:
         score = 0
         details = []
         
-        if not metrics or not financial_line_items:
+        if not metrics or not arrays:
             return {
                 "score": 0,
                 "details": "Insufficient data to analyze business quality"
             }
         
+        revenues = _present(arrays.revenue)
+        fcf_vals = _present(arrays.fcf)
+        op_margin_vals = _present(arrays.op_margin)
+        
         # 1. Multi-period revenue growth analysis
-        revenues = [item.revenue for item in financial_line_items if item.revenue is not None]
         if len(revenues) >= 2:
             initial, final = revenues[0], revenues[-1]
             if initial and final and final > initial:
@@ -125,11 +279,8 @@ class BillAckmanAgent:
             details.append("Not enough revenue data for multi-period trend.")
         
         # 2. Operating margin and free cash flow consistency
-        fcf_vals = [item.free_cash_flow for item in financial_line_items if item.free_cash_flow is not None]
-        op_margin_vals = [item.operating_margin for item in financial_line_items if item.operating_margin is not None]
-        
-        if op_margin_vals:
-            above_15 = sum(1 for m in op_margin_vals if m > 0.15)
+        if op_margin_vals.size:
+            above_15 = int(np.count_nonzero(op_margin_vals > 0.15))
             if above_15 >= (len(op_margin_vals) // 2 + 1):
                 score += 2
                 details.append("Operating margins have often exceeded 15% (indicates good profitability).")
@@ -138,8 +289,8 @@ class BillAckmanAgent:
         else:
             details.append("No operating margin data across periods.")
         
-        if fcf_vals:
-            positive_fcf_count = sum(1 for f in fcf_vals if f > 0)
+        if fcf_vals.size:
+            positive_fcf_count = int(np.count_nonzero(fcf_vals > 0))
             if positive_fcf_count >= (len(fcf_vals) // 2 + 1):
                 score += 1
                 details.append("Majority of periods show positive free cash flow.")
@@ -164,7 +315,7 @@ class BillAckmanAgent:
             "details": "; ".join(details)
         }
     
-    def _analyze_financial_discipline(self, metrics, financial_line_items):
+    def _analyze_financial_discipline(self, metrics, arrays: _LineArrays):
         """
         Evaluate the company's balance sheet over multiple periods:
         - Debt ratio trends
@@ -173,16 +324,19 @@ class BillAckmanAgent:
         score = 0
         details = []
         
-        if not metrics or not financial_line_items:
+        if not metrics or not arrays:
             return {
                 "score": 0,
                 "details": "Insufficient data to analyze financial discipline"
             }
         
+        debt_to_equity_vals = _present(arrays.debt_to_equity)
+        dividends_list = _present(arrays.dividends)
+        shares = _present(arrays.shares)
+        
         # 1. Multi-period debt ratio or debt_to_equity
-        debt_to_equity_vals = [item.debt_to_equity for item in financial_line_items if item.debt_to_equity is not None]
-        if debt_to_equity_vals:
-            below_one_count = sum(1 for d in debt_to_equity_vals if d < 1.0)
+        if debt_to_equity_vals.size:
+            below_one_count = int(np.count_nonzero(debt_to_equity_vals < 1.0))
             if below_one_count >= (len(debt_to_equity_vals) // 2 + 1):
                 score += 2
                 details.append("Debt-to-equity < 1.0 for the majority of periods (reasonable leverage).")
@@ -190,13 +344,12 @@ class BillAckmanAgent:
                 details.append("Debt-to-equity >= 1.0 in many periods (could be high leverage).")
         else:
             # Fallback to total_liabilities / total_assets
-            liab_to_assets = []
-            for item in financial_line_items:
-                if item.total_liabilities and item.total_assets and item.total_assets > 0:
-                    liab_to_assets.append(item.total_liabilities / item.total_assets)
+            liab, assets = arrays.liab, arrays.assets
+            valid = ~np.isnan(liab) & (liab != 0) & (assets > 0)
+            liab_to_assets = liab[valid] / assets[valid]
             
-            if liab_to_assets:
-                below_50pct_count = sum(1 for ratio in liab_to_assets if ratio < 0.5)
+            if liab_to_assets.size:
+                below_50pct_count = int(np.count_nonzero(liab_to_assets < 0.5))
                 if below_50pct_count >= (len(liab_to_assets) // 2 + 1):
                     score += 2
                     details.append("Liabilities-to-assets < 50% for majority of periods.")
@@ -206,13 +359,8 @@ class BillAckmanAgent:
                 details.append("No consistent leverage ratio data available.")
         
         # 2. Capital allocation approach (dividends + share counts)
-        dividends_list = [
-            item.dividends_and_other_cash_distributions
-            for item in financial_line_items
-            if item.dividends_and_other_cash_distributions is not None
-        ]
-        if dividends_list:
-            paying_dividends_count = sum(1 for d in dividends_list if d < 0)
+        if dividends_list.size:
+            paying_dividends_count = int(np.count_nonzero(dividends_list < 0))
             if paying_dividends_count >= (len(dividends_list) // 2 + 1):
                 score += 1
                 details.append("Company has a history of returning capital to shareholders (dividends).")
@@ -222,7 +370,6 @@ class BillAckmanAgent:
             details.append("No dividend data found across periods.")
         
         # Check for decreasing share count (simple approach)
-        shares = [item.outstanding_shares for item in financial_line_items if item.outstanding_shares is not None]
         if len(shares) >= 2:
             if shares[-1] < shares[0]:
                 score += 1
@@ -237,22 +384,22 @@ class BillAckmanAgent:
             "details": "; ".join(details)
         }
     
-    def _analyze_activism_potential(self, financial_line_items):
+    def _analyze_activism_potential(self, arrays: _LineArrays):
         """
         Bill Ackman often engages in activism if a company has a decent brand or moat
         but is underperforming operationally.
         """
-        if not financial_line_items:
+        if not arrays:
             return {
                 "score": 0,
                 "details": "Insufficient data for activism potential"
             }
         
         # Check revenue growth vs. operating margin
-        revenues = [item.revenue for item in financial_line_items if item.revenue is not None]
-        op_margins = [item.operating_margin for item in financial_line_items if item.operating_margin is not None]
+        revenues = _present(arrays.revenue)
+        op_margins = _present(arrays.op_margin)
         
-        if len(revenues) < 2 or not op_margins:
+        if len(revenues) < 2 or not op_margins.size:
             return {
                 "score": 0,
                 "details": "Not enough data to assess activism potential (need multi-year revenue + margins)."
@@ -260,7 +407,7 @@ class BillAckmanAgent:
         
         initial, final = revenues[0], revenues[-1]
         revenue_growth = (final - initial) / abs(initial) if initial else 0
-        avg_margin = sum(op_margins) / len(op_margins)
+        avg_margin = op_margins.mean()
         
         score = 0
         details = []
@@ -277,25 +424,25 @@ class BillAckmanAgent:
         
         return {"score": score, "details": "; ".join(details)}
     
-    def _analyze_valuation(self, financial_line_items, market_cap):
+    def _analyze_valuation(self, arrays: _LineArrays, market_cap, intrinsic_value: float = None):
         """
         Ackman invests in companies trading at a discount to intrinsic value.
         Uses a simplified DCF with FCF as a proxy, plus margin of safety analysis.
+        intrinsic_value may be passed in when it was already computed in a batch.
         """
-        if not financial_line_items or market_cap is None:
+        if not arrays or market_cap is None:
             return {
                 "score": 0,
                 "details": "Insufficient data to perform valuation"
             }
         
-        if not financial_line_items:
+        if not arrays:
             return {
                 "score": 0,
                 "details": "No financial line items available"
             }
             
-        latest = financial_line_items[0]
-        fcf = latest.free_cash_flow if latest.free_cash_flow else 0
+        fcf = _latest_fcf(arrays)
         
         if fcf <= 0:
             return {
@@ -304,24 +451,8 @@ class BillAckmanAgent:
                 "intrinsic_value": None
             }
         
-        # Basic DCF assumptions
-        growth_rate = 0.06
-        discount_rate = 0.10
-        terminal_multiple = 15
-        projection_years = 5
-        
-        present_value = 0
-        for year in range(1, projection_years + 1):
-            future_fcf = fcf * (1 + growth_rate) ** year
-            pv = future_fcf / ((1 + discount_rate) ** year)
-            present_value += pv
-        
-        # Terminal Value
-        terminal_value = (
-            fcf * (1 + growth_rate) ** projection_years * terminal_multiple
-        ) / ((1 + discount_rate) ** projection_years)
-        
-        intrinsic_value = present_value + terminal_value
+        if intrinsic_value is None:
+            intrinsic_value = _dcf_intrinsic_value(fcf, _GROWTH_RATE, _DISCOUNT_RATE, _TERMINAL_MULTIPLE, _PROJECTION_YEARS)
         margin_of_safety = (intrinsic_value - market_cap) / market_cap
         
         score = 0
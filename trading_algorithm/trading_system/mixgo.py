@@ -1,4 +1,7 @@
-from typing import Dict, List, Any, TypedDict
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple, TypedDict, Union
+import numpy as np
 import polars as pl
 from pydantic import BaseModel, Field
 from signals.data.models import AnalystSignal
@@ -6,6 +9,40 @@ from signals.llm.client import LLMClient
 from signals.llm.prompts import MEGA_AGENT_PROMPT
 from signals.utils.progress import progress
 
+if TYPE_CHECKING:
+    from trading_system.bill_ackman import BillAckmanAgent
+    from trading_system.michael_burry import MichaelBurryAgent
+    from trading_system.technical_analyst import TechnicalAnalystAgent
+    
+    DefaultAgent = Union[BillAckmanAgent, MichaelBurryAgent, TechnicalAnalystAgent]
+
+log = logging.getLogger(__name__)
+
+# Default analyst agents, created on first use; they hold no per-run state so
+# every MixGoAgent can share them
+_DEFAULT_AGENTS: Optional[Tuple["DefaultAgent", ...]] = None
+
+
+def _get_default_agents() -> List["DefaultAgent"]:
+    """
+    Get the three core analyst agents, importing and creating them on first use.
+    
+    Returns:
+        list: A new list holding the shared agent instances
+    """
+    global _DEFAULT_AGENTS
+    if _DEFAULT_AGENTS is None:
+        from trading_system.bill_ackman import BillAckmanAgent
+        from trading_system.michael_burry import MichaelBurryAgent
+        from trading_system.technical_analyst import TechnicalAnalystAgent
+        
+        _DEFAULT_AGENTS = (
+            BillAckmanAgent(),
+            MichaelBurryAgent(),
+            TechnicalAnalystAgent()
+        )
+    return list(_DEFAULT_AGENTS)
+
 class MegaAgentDecision(BaseModel):
     """Final trading decision model."""
     action: str = Field(description="Trading action: buy, sell, short, cover, or hold")
@@ -41,19 +78,7 @@ class MixGoAgent:
         # Import RiskManager at the top level since we always need it
         from trading_system.risk_manager import RiskManager
         
-        # Import other agents only if needed
-        if agents is None:
-            from trading_system.bill_ackman import BillAckmanAgent
-            from trading_system.michael_burry import MichaelBurryAgent
-            from trading_system.technical_analyst import TechnicalAnalystAgent
-            
-            self.agents = [
-                BillAckmanAgent(),
-                MichaelBurryAgent(),
-                TechnicalAnalystAgent()
-            ]
-        else:
-            self.agents = agents
+        self.agents = agents if agents is not None else _get_default_agents()
             
         # Always initialize risk manager
         self.risk_manager = RiskManager()
@@ -86,57 +111,84 @@ class MixGoAgent:
         progress.update_status("mixgo_agent", None, "Collecting signals from all agents")
         all_signals = {}
         
+        # Price history and agent signals are independent, I/O-bound fetches,
+        # so they all run concurrently on worker threads
+        price_results, agent_results = await asyncio.gather(
+            asyncio.gather(
+                *(asyncio.to_thread(data_fetcher.get_prices, ticker, start_date, end_date) for ticker in tickers),
+                return_exceptions=True
+            ),
+            asyncio.gather(
+                *(asyncio.to_thread(agent.analyze, tickers, data_fetcher, end_date, start_date) for agent in self.agents)
+            )
+        )
+        
         # Collect price data for risk analysis
         prices_dict = {}
-        for ticker in tickers:
-            try:
-                price_df = data_fetcher.get_prices(ticker, start_date, end_date)
-                prices_dict[ticker] = price_df
-            except Exception as e:
-                print(f"Warning: Could not fetch prices for {ticker}: {e}")
-                prices_dict[ticker] = pl.DataFrame()
+        for ticker, price_df in zip(tickers, price_results):
+            if isinstance(price_df, Exception):
+                print(f"Warning: Could not fetch prices for {ticker}: {price_df}")
+                price_df = pl.DataFrame()
+            prices_dict[ticker] = price_df
+        
+        # Step 2: Organize signals by ticker as each source's signals are collected
+        ticker_signals = {ticker: {} for ticker in tickers}
+        
+        def collect(agent_name: str, agent_signals: Dict[str, AnalystSignal]):
+            all_signals[agent_name] = agent_signals
+            for ticker, signal in agent_signals.items():
+                # Unset fields (max_position_size outside the risk manager) are left out of the prompt
+                ticker_signals[ticker][agent_name] = signal.model_dump(exclude_none=True)
         
         # Get signals from trading agents
-        for agent in self.agents:
-            agent_signals = agent.analyze(tickers, data_fetcher, end_date, start_date)
-            all_signals[agent.name] = agent_signals
+        for agent, agent_signals in zip(self.agents, agent_results):
+            collect(agent.name, agent_signals)
         
         # Get risk management signals
-        risk_signals = self.risk_manager.analyze(tickers, prices_dict, portfolio, end_date)
-        all_signals["risk_manager"] = risk_signals
-        
-        # Step 2: Organize signals by ticker
-        ticker_signals = {ticker: {} for ticker in tickers}
-        for agent_name, agent_signals in all_signals.items():
-            for ticker, signal in agent_signals.items():
-                ticker_signals[ticker][agent_name] = signal.model_dump()
+        collect("risk_manager", self.risk_manager.analyze(tickers, prices_dict, portfolio, end_date))
         
         # Step 3: Generate decisions with LLM meta-reasoning
-        decisions = {}
         progress.update_status("mixgo_agent", None, "Generating trading decisions")
         
-        for ticker in tickers:
+        # Cash and portfolio context are the same for every ticker
+        position_arrays = self._positions_to_arrays(portfolio)
+        portfolio_context = {
+            "total_value": self._calculate_portfolio_value(portfolio, position_arrays),
+            "exposure": self._calculate_portfolio_exposure(portfolio, position_arrays),
+            "margin_used": portfolio.get("margin_used", 0),
+            "margin_requirement": portfolio.get("margin_requirement", 0)
+        }
+        base_context = {
+            "cash": portfolio.get("cash", 0),
+            "portfolio_context": portfolio_context
+        }
+        
+        async def decide(ticker: str) -> MegaAgentDecision:
+            # A ticker with no risk budget always ends up on hold, so skip the LLM round trip
+            risk_signal = all_signals.get("risk_manager", {}).get(ticker)
+            if risk_signal and (risk_signal.max_position_size or 0) == 0:
+                progress.update_status("mixgo_agent", ticker, "Blocked by risk management")
+                return MegaAgentDecision(
+                    action="hold",
+                    quantity=0,
+                    confidence=30.0,
+                    reasoning="[Position blocked by risk management - insufficient risk budget]"
+                )
+            
             progress.update_status("mixgo_agent", ticker, "Applying LLM meta-reasoning")
             
-            # Get current position and cash information
+            # Get current position and price information
             position = self._get_position_info(portfolio, ticker)
-            cash = portfolio.get("cash", 0)
-            current_price = self._get_current_price(data_fetcher, ticker, end_date)
+            current_price = self._get_current_price(prices_dict[ticker], ticker)
             
-            # Prepare the context for the LLM
-            context = TickerContext(
-                ticker=ticker,
-                signals=ticker_signals[ticker],
-                position=position,
-                price=current_price,
-                cash=cash,
-                portfolio_context={
-                    "total_value": self._calculate_portfolio_value(portfolio),
-                    "exposure": self._calculate_portfolio_exposure(portfolio),
-                    "margin_used": portfolio.get("margin_used", 0),
-                    "margin_requirement": portfolio.get("margin_requirement", 0)
-                }
-            )
+            # Prepare the context for the LLM (a TickerContext is a plain dict at runtime)
+            context: TickerContext = {
+                "ticker": ticker,
+                "signals": ticker_signals[ticker],
+                "position": position,
+                "price": current_price,
+                **base_context
+            }
             
             # Call the LLM for meta-reasoning and decision
             decision = await self.llm_client.generate_decision(
@@ -149,38 +201,23 @@ class MixGoAgent:
             # Apply risk management constraints
             decision = self._apply_risk_constraints(decision, ticker, all_signals)
             
-            print(f"Decision from LLM for {ticker}: {decisions}")
-            decisions[ticker] = decision
+            log.debug("Decision from LLM for %s: %s", ticker, decision)
             progress.update_status("mixgo_agent", ticker, "Decision generated")
+            return decision
+        
+        # Overlap the per-ticker LLM round trips
+        decision_results = await asyncio.gather(*(decide(ticker) for ticker in tickers))
+        decisions = dict(zip(tickers, decision_results))
         
         progress.update_status("mixgo_agent", None, "All decisions generated")
         
         # Step 4: Apply portfolio-level risk optimization
-        optimized_decisions = self._optimize_portfolio_decisions(decisions, portfolio)
+        optimized_decisions = self._optimize_portfolio_decisions(
+            decisions, portfolio, verbose, portfolio_value=portfolio_context["total_value"]
+        )
         
         return optimized_decisions
     
-    def _calculate_portfolio_value(self, portfolio: Dict) -> float:
-        """Calculate total portfolio value including cash and positions."""
-        try:
-            cash = float(portfolio.get("cash", 0))
-            positions_value = 0
-            positions = portfolio.get("positions", {})
-            
-            if isinstance(positions, dict):
-                for ticker, position in positions.items():
-                    if isinstance(position, dict):
-                        # Handle different position structures
-                        shares = position.get("shares", 0)
-                        avg_price = position.get("average_price", 0)
-                        
-                        if shares and avg_price:
-                            positions_value += shares * avg_price
-            
-            return max(cash + positions_value, 10000)  # Minimum portfolio value
-        except Exception:
-            return 10000  # Default portfolio value
-    
     def _apply_risk_constraints(self, decision: MegaAgentDecision, ticker: str, all_signals: Dict) -> MegaAgentDecision:
         """
         Apply risk management constraints to individual trading decisions.
@@ -215,11 +252,18 @@ class MixGoAgent:
         
         return decision
     
-    def _optimize_portfolio_decisions(self, decisions: Dict[str, MegaAgentDecision], portfolio: Dict) -> Dict[str, MegaAgentDecision]:
+    def _optimize_portfolio_decisions(
+        self,
+        decisions: Dict[str, MegaAgentDecision],
+        portfolio: Dict,
+        verbose: bool = False,
+        portfolio_value: float = None
+    ) -> Dict[str, MegaAgentDecision]:
         """
         Apply portfolio-level optimization and risk management.
         """
-        portfolio_value = self._calculate_portfolio_value(portfolio)
+        if portfolio_value is None:
+            portfolio_value = self._calculate_portfolio_value(portfolio)
         
         # Use risk manager's portfolio optimization
         allocation = self.risk_manager.optimize_portfolio_allocation(decisions, portfolio_value)
@@ -228,17 +272,18 @@ class MixGoAgent:
         optimized_decisions = decisions.copy()
         
         # Log portfolio summary
-        summary = self.risk_manager.get_portfolio_summary(portfolio)
-        print(f"\n💼 Portfolio Summary:")
-        print(f"   💰 Total Value: ${summary['total_value']:,.2f}")
-        print(f"   💵 Cash: ${summary['cash']:,.2f} ({summary['cash_pct']:.1%})")
-        print(f"   📊 Positions: {summary['positions_count']}")
-        print(f"   📈 Long Exposure: ${summary['long_exposure']:,.2f}")
-        print(f"   📉 Short Exposure: ${summary['short_exposure']:,.2f}")
-        print(f"   🎯 Largest Position: {summary['largest_position_pct']:.1%}")
-        
-        if not summary['risk_metrics']['within_risk_limits']:
-            print(f"   ⚠️  Warning: Portfolio exceeds risk limits!")
+        if verbose:
+            summary = self.risk_manager.get_portfolio_summary(portfolio)
+            print(f"\n💼 Portfolio Summary:")
+            print(f"   💰 Total Value: ${summary['total_value']:,.2f}")
+            print(f"   💵 Cash: ${summary['cash']:,.2f} ({summary['cash_pct']:.1%})")
+            print(f"   📊 Positions: {summary['positions_count']}")
+            print(f"   📈 Long Exposure: ${summary['long_exposure']:,.2f}")
+            print(f"   📉 Short Exposure: ${summary['short_exposure']:,.2f}")
+            print(f"   🎯 Largest Position: {summary['largest_position_pct']:.1%}")
+            
+            if not summary['risk_metrics']['within_risk_limits']:
+                print(f"   ⚠️  Warning: Portfolio exceeds risk limits!")
         
         return optimized_decisions
     
@@ -255,45 +300,56 @@ class MixGoAgent:
             "short_margin_used": ticker_position.get("short_margin_used", 0)
         }
     
-    def _get_current_price(self, data_fetcher, ticker, end_date):
-        """Get the current price for a ticker."""
+    def _get_current_price(self, prices_df, ticker):
+        """Get the current price for a ticker from its already-fetched price history."""
         try:
-            # Try to get the most recent price using Polars
-            prices_df = data_fetcher.get_prices(ticker, None, end_date)
-            if not prices_df.is_empty():
-                # Use Polars syntax to get the last close price
-                return float(prices_df.select(pl.col("close")).tail(1).item())
+            if prices_df is not None and len(prices_df) > 0:
+                # Both price sources return bars in ascending date order, so the
+                # last close is the latest; read it off the column without
+                # building a projected 1-row frame
+                return float(prices_df.get_column("close")[-1])
         except Exception as e:
-            print(f"Error fetching price for {ticker}: {e}")
+            print(f"Error reading price for {ticker}: {e}")
         
         # Default fallback value if price can't be fetched
         return 0.0
     
-    def _calculate_portfolio_value(self, portfolio):
-        """Calculate total portfolio value including positions and cash."""
-        cash = portfolio.get("cash", 0)
-        positions = portfolio.get("positions", {})
+    def _positions_to_arrays(self, portfolio):
+        """
+        Collect position sizes and cost bases into arrays in a single pass.
         
-        position_value = 0
-        for ticker_pos in positions.values():
-            long_value = ticker_pos.get("long", 0) * ticker_pos.get("long_cost_basis", 0)
-            # Short positions represent a liability, so we subtract them
-            short_value = ticker_pos.get("short", 0) * ticker_pos.get("short_cost_basis", 0)
-            position_value += long_value - short_value
+        Args:
+            portfolio: Current portfolio state
+            
+        Returns:
+            tuple: (longs, long_basis, shorts, short_basis) float arrays, one entry per position
+        """
+        rows = [
+            (
+                ticker_pos.get("long", 0),
+                ticker_pos.get("long_cost_basis", 0),
+                ticker_pos.get("short", 0),
+                ticker_pos.get("short_cost_basis", 0),
+            )
+            for ticker_pos in portfolio.get("positions", {}).values()
+        ]
+        longs, long_basis, shorts, short_basis = np.array(rows, dtype=np.float64).reshape(-1, 4).T
+        return longs, long_basis, shorts, short_basis
+    
+    def _calculate_portfolio_value(self, portfolio: Dict, position_arrays=None) -> float:
+        """Calculate total portfolio value including cash and positions."""
+        cash = float(portfolio.get("cash", 0))
+        longs, long_basis, shorts, short_basis = position_arrays or self._positions_to_arrays(portfolio)
         
-        return cash + position_value
+        # Short positions represent a liability, so we subtract them
+        return cash + float(longs @ long_basis - shorts @ short_basis)
     
-    def _calculate_portfolio_exposure(self, portfolio):
+    def _calculate_portfolio_exposure(self, portfolio, position_arrays=None):
         """Calculate portfolio exposure metrics."""
-        positions = portfolio.get("positions", {})
+        longs, long_basis, shorts, short_basis = position_arrays or self._positions_to_arrays(portfolio)
         
-        long_exposure = 0
-        short_exposure = 0
-        for ticker_pos in positions.values():
-            long_value = ticker_pos.get("long", 0) * ticker_pos.get("long_cost_basis", 0)
-            short_value = ticker_pos.get("short", 0) * ticker_pos.get("short_cost_basis", 0)
-            long_exposure += long_value
-            short_exposure += short_value
+        long_exposure = float(longs @ long_basis)
+        short_exposure = float(shorts @ short_basis)
         
         return {
             "long": long_exposure,
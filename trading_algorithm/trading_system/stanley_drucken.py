@@ -1,8 +1,59 @@
+import requests
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from signals.data.models import AnalystSignal
 from signals.utils.progress import progress
+from signals.utils._njit import njit, prange, warm_up
 import polars as pl
 import numpy as np
 
+
+# Signal names indexed by the codes _score_batch returns (-1 wraps to "bearish")
+_SIGNAL_NAMES = ("neutral", "bullish", "bearish")
+
+# Screen applied before the price fetch: micro caps and names without reported
+# revenue never produce a Druckenmiller signal
+_MIN_MARKET_CAP = 1e8
+
+
+@njit(parallel=True, cache=True)
+def _score_batch(growth_momentum: np.ndarray, risk_reward: np.ndarray, valuation: np.ndarray):
+    """
+    Weight the sub-scores and classify every ticker in one pass.
+    
+    Args:
+        growth_momentum: Growth & momentum score per ticker
+        risk_reward: Risk-reward score per ticker
+        valuation: Valuation score per ticker
+        
+    Returns:
+        tuple: (total scores, signal codes 1 bullish / 0 neutral / -1 bearish, confidences)
+    """
+    n = growth_momentum.shape[0]
+    total_scores = np.empty(n, dtype=np.float64)
+    codes = np.empty(n, dtype=np.int8)
+    confidences = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        # Combine sub-analyses with weights
+        total_score = growth_momentum[i] * 0.50 + risk_reward[i] * 0.30 + valuation[i] * 0.20
+        total_scores[i] = total_score
+        
+        # Generate signal based on total score. Written as selects rather than an
+        # if/elif chain so the loop compiles without unpredictable branches
+        bullish = total_score >= 7.5
+        bearish = total_score <= 4.5
+        codes[i] = np.int8(bullish) - np.int8(bearish)
+        
+        # Distance past the crossed threshold, 0 for neutral scores
+        excess = total_score - 7.5 if bullish else (4.5 - total_score if bearish else 0.0)
+        confidence = 50.0 + excess * 10.0
+        confidences[i] = confidence if confidence < 85.0 else 85.0
+    return total_scores, codes, confidences
+
+
+warm_up(_score_batch, np.zeros(1), np.zeros(1), np.zeros(1))
+
+
 class StanleyDruckenmillerAgent:
     """
     Analyzes stocks using Stanley Druckenmiller's investing principles:
@@ -13,6 +64,7 @@ class StanleyDruckenmillerAgent:
     
     def __init__(self):
         self.name = "stanley_druckenmiller"
+        self._agent_label = f"{self.name}_agent"
         
     def analyze(self, tickers, data_fetcher, end_date, start_date=None):
         """
@@ -21,62 +73,156 @@ class StanleyDruckenmillerAgent:
         Returns:
             dict: Ticker-to-signal mapping with confidence scores and reasoning
         """
-        signals = {}
+        # Progress is reported per stage for the whole batch rather than per ticker;
+        # each update redraws the status table
+        progress.update_status(self._agent_label, None, f"Fetching data for {len(tickers)} tickers")
         
-        for ticker in tickers:
-            progress.update_status(f"{self.name}_agent", ticker, "Analyzing growth & momentum")
-            
-            # Fetch required data
-            prices = data_fetcher.get_prices(ticker, start_date, end_date)
-            financial_metrics = data_fetcher.get_financial_metrics(ticker, end_date)
-            financial_line_items = data_fetcher.get_line_items(ticker, end_date)
-            market_cap = data_fetcher.get_market_cap(ticker, end_date)
-            
-            # Analyze growth and momentum
-            growth_momentum = self._analyze_growth_momentum(ticker, prices, financial_line_items)
-            
-            # Analyze risk-reward
-            risk_reward = self._analyze_risk_reward(ticker, financial_line_items, market_cap, prices)
-            
-            # Analyze valuation
-            valuation = self._analyze_valuation(ticker, financial_line_items, market_cap)
-            
-            # Combine sub-analyses with weights
-            total_score = (
-                growth_momentum["score"] * 0.50 +
-                risk_reward["score"] * 0.30 +
-                valuation["score"] * 0.20
-            )
-            
-            # Generate signal based on total score
-            if total_score >= 7.5:
-                signal = "bullish"
-                confidence = min(85, 50 + (total_score - 7.5) * 10)
-            elif total_score <= 4.5:
-                signal = "bearish"
-                confidence = min(85, 50 + (4.5 - total_score) * 10)
-            else:
-                signal = "neutral" 
-                confidence = 50
-                
-            # Create reasoning structure
-            reasoning = {
-                "growth_momentum": growth_momentum["details"],
-                "risk_reward": risk_reward["details"],
-                "valuation": valuation["details"],
-                "total_score": total_score
+        # Line items for every ticker come back from one search request; tickers
+        # the batch could not answer are refetched individually in _fetch_ticker_data
+        line_items_by_ticker = data_fetcher.get_line_items_batch(list(tickers), end_date)
+        missing = [ticker for ticker in tickers if ticker not in line_items_by_ticker]
+        if missing:
+            warnings.warn(f"{self.name}: batched line items failed for {', '.join(missing)}, fetching per ticker")
+        
+        # Each ticker spends most of its time waiting on its remaining data
+        # requests, so the fetches run concurrently
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                executor.submit(
+                    self._fetch_ticker_data, ticker, data_fetcher, end_date, start_date,
+                    line_items_by_ticker.get(ticker)
+                ): ticker
+                for ticker in tickers
             }
-            
-            signals[ticker] = AnalystSignal(
-                signal=signal,
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    fetched[ticker] = future.result()
+                except (requests.RequestException, LookupError, TimeoutError) as e:
+                    warnings.warn(f"{self.name}: skipping {ticker}: {e}")
+        
+        # Keep the caller's ticker order; screened-out tickers were fetched as the reason
+        scored = [ticker for ticker in tickers if isinstance(fetched.get(ticker), tuple)]
+        progress.update_status(self._agent_label, None, f"Analyzing growth & momentum for {len(scored)} tickers")
+        analyses = [self._analyze_ticker(ticker, *fetched[ticker]) for ticker in scored]
+        
+        # Weight and classify every ticker's sub-scores in one kernel call. Each
+        # row is built contiguous so the call matches the signature compiled at import
+        sub_scores = np.array(
+            [[analysis[k]["score"] for analysis in analyses] for k in range(3)], dtype=np.float64
+        ).reshape(3, -1)
+        total_scores, codes, confidences = _score_batch(sub_scores[0], sub_scores[1], sub_scores[2])
+        
+        scored_signals = {
+            ticker: AnalystSignal(
+                signal=_SIGNAL_NAMES[code],
                 confidence=confidence,
-                reasoning=reasoning
+                reasoning={
+                    "growth_momentum": growth_momentum["details"],
+                    "risk_reward": risk_reward["details"],
+                    "valuation": valuation["details"],
+                    "total_score": total_score
+                }
             )
-            
-            progress.update_status(f"{self.name}_agent", ticker, "Done")
-            
+            for ticker, (growth_momentum, risk_reward, valuation), total_score, code, confidence in zip(
+                scored, analyses, total_scores.tolist(), codes.tolist(), confidences.tolist()
+            )
+        }
+        
+        # Tickers that failed the screen get a neutral signal without analysis
+        signals = {
+            ticker: scored_signals[ticker] if ticker in scored_signals else self._screened_out_signal(fetched[ticker])
+            for ticker in tickers
+            if ticker in fetched
+        }
+        
+        progress.update_status(self._agent_label, None, "Done")
+        
         return signals
     
+    def _fetch_ticker_data(self, ticker, data_fetcher, end_date, start_date=None, financial_line_items=None):
+        """
+        Fetch the data Druckenmiller's analysis needs for one ticker.
+        
+        Args:
+            financial_line_items: Line items already fetched in the batch request;
+                fetched individually when None
+        
+        Returns:
+            tuple: (prices, financial metrics, line items, market cap), or the
+            reason as a string when the ticker fails the screen
+            
+        Raises:
+            LookupError: When the line items could not be fetched at all
+        """
+        # Fetch required data; market cap is read from the metrics just fetched
+        financial_metrics = data_fetcher.get_financial_metrics(ticker, end_date)
+        if financial_line_items is None:
+            # A one-ticker batch leaves the ticker out on failure, unlike get_line_items,
+            # which would turn the failure into an empty (no revenue) result
+            financial_line_items = data_fetcher.get_line_items_batch([ticker], end_date).get(ticker)
+            if financial_line_items is None:
+                raise LookupError(f"line items unavailable for {ticker}")
+        market_cap = data_fetcher.get_market_cap(ticker, end_date, metrics=financial_metrics)
+        
+        # Screened-out names skip the price history, the most expensive fetch
+        screen_reason = self._screen_reason(financial_line_items, market_cap)
+        if screen_reason is not None:
+            return screen_reason
+        
+        prices = data_fetcher.get_prices(ticker, start_date, end_date)
+        
+        return prices, financial_metrics, financial_line_items, market_cap
+    
+    @staticmethod
+    def _screened_out_signal(reason: str) -> AnalystSignal:
+        """Neutral signal for a ticker that failed the pre-analysis screen."""
+        return AnalystSignal(
+            signal="neutral",
+            confidence=50,
+            reasoning={
+                "skipped": True,
+                "details": reason
+            }
+        )
+    
+    @staticmethod
+    def _screen_reason(financial_line_items, market_cap):
+        """
+        Why a ticker is not worth a full analysis, judged only on data that was fetched.
+        
+        The line items passed in were fetched successfully (a failed fetch raises
+        earlier). A missing market cap may be a failed metrics request rather than
+        a tiny company, so it never screens a ticker out on its own.
+        
+        Returns:
+            str: The reason, or None when the ticker passes the screen
+        """
+        if market_cap is not None and market_cap < _MIN_MARKET_CAP:
+            return f"Market cap {market_cap:,.0f} below {_MIN_MARKET_CAP:,.0f} screen"
+        if not any(getattr(item, "revenue", None) is not None for item in financial_line_items):
+            return "No reported revenue"
+        return None
+    
+    def _analyze_ticker(self, ticker, prices, financial_metrics, financial_line_items, market_cap):
+        """
+        Run the three sub-analyses for one ticker's fetched data.
+        
+        Returns:
+            tuple: (growth & momentum, risk-reward, valuation) result dicts
+        """
+        # Analyze growth and momentum
+        growth_momentum = self._analyze_growth_momentum(ticker, prices, financial_line_items)
+        
+        # Analyze risk-reward
+        risk_reward = self._analyze_risk_reward(ticker, financial_line_items, market_cap, prices)
+        
+        # Analyze valuation
+        valuation = self._analyze_valuation(ticker, financial_line_items, market_cap)
+        
+        return growth_momentum, risk_reward, valuation
+    
     def _analyze_growth_momentum(self, ticker, prices, financial_line_items):
         # Implementation of growth momentum analysis
         # ...
@@ -1,9 +1,171 @@
+import hashlib
 import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import polars as pl
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from signals.data.models import AnalystSignal
 from signals.utils.progress import progress
+from signals.utils._njit import HAS_NUMBA, njit, warm_up
+
+
+# Columns the indicator pipeline reads from every price frame
+_PRICE_COLUMNS = ("close", "high", "low", "volume")
+
+# Columns a frame must have; missing high/low only null ADX and ATR, and a
+# missing volume only nulls volume_momentum
+_REQUIRED_PRICE_COLUMNS = ("close",)
+
+# Tickers' latest indicator values kept between analyze() calls
+_INDICATOR_CACHE_SIZE = 2048
+
+# Strategies in the column order _combine_signals reads, with their reasoning keys
+_STRATEGY_ORDER = ("trend", "mean_reversion", "momentum", "volatility", "stat_arb")
+_REASONING_KEYS = ("trend_following", "mean_reversion", "momentum", "volatility", "statistical_arbitrage")
+
+# Numeric value of each strategy signal; unknown signals count as neutral
+_SIGNAL_VALUES = {"bullish": 1.0, "neutral": 0.0, "bearish": -1.0}
+
+# Signal names indexed by the codes _combine_signals returns (-1 wraps to "bearish")
+_SIGNAL_NAMES = ("neutral", "bullish", "bearish")
+
+# Longest rolling window behind each indicator; with fewer bars it can only be null
+_MIN_HISTORY = {
+    "z_score": 50,
+    "bb_upper": 20,
+    "bb_lower": 20,
+    "rsi_14": 14,
+    "rsi_28": 28,
+    "mom_1m": 21,
+    "mom_3m": 63,
+    "mom_6m": 126,
+    "volume_momentum": 21,
+    "hist_vol": 21,
+    "vol_regime": 63,
+    "vol_z_score": 63,
+    "atr": 14,
+    "skew": 63,
+}
+
+
+def _price_digest(ticker: str, prices_df: pl.DataFrame) -> bytes:
+    """
+    Identity of a ticker's price history: a digest of every bar the indicators read.
+    
+    EMAs depend on the whole history, so any revised bar, not only the last one,
+    changes the key.
+    """
+    digest = hashlib.blake2b(ticker.encode(), digest_size=16)
+    for column in _PRICE_COLUMNS:
+        if column not in prices_df.columns:
+            digest.update(f"no {column}".encode())
+            continue
+        digest.update(prices_df[column].cast(pl.Float64, strict=False).to_numpy().tobytes())
+    return digest.digest()
+
+
+@njit(cache=True)
+def _hurst_tau(prices: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Square root of the standard deviation of lagged price differences, per lag.
+    
+    Walks the series once per lag instead of allocating the difference array,
+    using a two-pass mean / variance like np.std.
+    
+    Args:
+        prices: Contiguous float64 price series
+        max_lag: Lags 2 .. min(max_lag, len(prices) // 2) - 1 are used
+        
+    Returns:
+        np.ndarray: One value per lag, floored at 1e-8
+    """
+    n = prices.shape[0]
+    upper = min(max_lag, n // 2)
+    tau = np.empty(max(upper - 2, 0), dtype=np.float64)
+    for k in range(upper - 2):
+        lag = k + 2
+        count = n - lag
+        
+        total = 0.0
+        for i in range(count):
+            total += prices[i + lag] - prices[i]
+        mean = total / count
+        
+        squares = 0.0
+        for i in range(count):
+            deviation = prices[i + lag] - prices[i] - mean
+            squares += deviation * deviation
+        
+        value = math.sqrt(math.sqrt(squares / count))
+        tau[k] = value if value > 1e-8 else 1e-8
+    return tau
+
+
+if HAS_NUMBA:
+    warm_up(_hurst_tau, np.arange(64, dtype=np.float64), 20)
+else:
+    def _hurst_tau(prices: np.ndarray, max_lag: int) -> np.ndarray:
+        """NumPy version of the kernel above; its element loops would be far slower interpreted."""
+        upper = min(max_lag, prices.shape[0] // 2)
+        tau = np.array([np.sqrt(np.std(prices[lag:] - prices[:-lag])) for lag in range(2, upper)], dtype=np.float64)
+        return np.fmax(tau, 1e-8)  # fmax, like the kernel, floors NaN as well
+
+
+@njit(cache=True)
+def _combine_signals(signal_values: np.ndarray, confidences: np.ndarray, weights: np.ndarray):
+    """
+    Weighted ensemble of the strategy signals, classified for every ticker in one pass.
+    
+    Args:
+        signal_values: (tickers, strategies) signals as 1 / 0 / -1
+        confidences: (tickers, strategies) confidences; NaN for missing
+        weights: Weight per strategy
+        
+    Returns:
+        tuple: (signal codes 1 bullish / 0 neutral / -1 bearish, confidences in [0, 1])
+    """
+    n_tickers, n_strategies = signal_values.shape
+    codes = np.empty(n_tickers, dtype=np.int8)
+    combined = np.empty(n_tickers, dtype=np.float64)
+    for i in range(n_tickers):
+        weighted_sum = 0.0
+        total_confidence = 0.0
+        for j in range(n_strategies):
+            # Missing confidences default to 0.5, then clamp to the valid range
+            confidence = confidences[i, j]
+            confidence = confidence if math.isfinite(confidence) else 0.5
+            confidence = confidence if confidence < 1.0 else 1.0
+            confidence = confidence if confidence > 0.0 else 0.0
+            weighted_sum += signal_values[i, j] * weights[j] * confidence
+            total_confidence += weights[j] * confidence
+        
+        # Normalize the weighted sum
+        final_score = weighted_sum / total_confidence if total_confidence > 0 else 0.0
+        final_score = final_score if math.isfinite(final_score) else 0.0
+        
+        codes[i] = np.int8(final_score > 0.2) - np.int8(final_score < -0.2)
+        confidence = abs(final_score)
+        combined[i] = confidence if confidence < 1.0 else 1.0
+    return codes, combined
+
+
+if HAS_NUMBA:
+    warm_up(_combine_signals, np.zeros((1, 5)), np.zeros((1, 5)), np.zeros(5))
+else:
+    def _combine_signals(signal_values: np.ndarray, confidences: np.ndarray, weights: np.ndarray):
+        """NumPy version of the kernel above, vectorized over tickers and strategies."""
+        confidences = np.clip(np.where(np.isfinite(confidences), confidences, 0.5), 0.0, 1.0)
+        weighted_sum = (signal_values * weights * confidences).sum(axis=1)
+        total_confidence = (weights * confidences).sum(axis=1)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            final_score = np.where(total_confidence > 0, weighted_sum / total_confidence, 0.0)
+        final_score = np.where(np.isfinite(final_score), final_score, 0.0)
+        
+        codes = (final_score > 0.2).astype(np.int8) - (final_score < -0.2).astype(np.int8)
+        return codes, np.minimum(np.abs(final_score), 1.0)
+
 
 class TechnicalAnalystAgent:
     """
@@ -27,76 +189,64 @@ class TechnicalAnalystAgent:
             "volatility": 0.15,
             "stat_arb": 0.15,
         }
+        # Centered log-lags for the Hurst fit at the default max_lag of 20 (lags 2..19)
+        log_lags = np.log(np.arange(2, 20, dtype=np.float64))
+        self._hurst_log_lags = log_lags - log_lags.mean()
+        self._hurst_log_lags_ss = float(self._hurst_log_lags @ self._hurst_log_lags)
+        # Latest indicator values by _price_digest, least recently used first
+        self._indicator_cache: OrderedDict = OrderedDict()
+        # Indicator expressions are data-independent; see _build_indicator_plan
+        self._shared_stages, self._indicator_aggregations = self._build_indicator_plan()
     
     def analyze(self, tickers: List[str], data_fetcher, end_date, start_date=None) -> Dict[str, AnalystSignal]:
         """Generate signals for multiple tickers based on technical analysis."""
         signals = {}
         
-        for ticker in tickers:
-            progress.update_status(f"{self.name}_agent", ticker, "Analyzing price data")
-            
-            # Get price data (now expecting Polars DataFrame)
-            prices_df = data_fetcher.get_prices(ticker, start_date, end_date)
-            
+        # Get price data (now expecting Polars DataFrames). The requests are
+        # I/O-bound and independent, so they run concurrently; map keeps ticker order
+        price_frames = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(tickers)))) as executor:
+            fetched = list(executor.map(
+                lambda ticker: self._fetch_prices(ticker, data_fetcher, end_date, start_date), tickers
+            ))
+        
+        for ticker, prices_df in zip(tickers, fetched):
             if prices_df.is_empty():
                 progress.update_status(f"{self.name}_agent", ticker, "Failed: No price data found")
                 continue
             
-            # Calculate individual technical signals
-            progress.update_status(f"{self.name}_agent", ticker, "Calculating trend signals")
-            trend_signals = self._calculate_trend_signals(prices_df)
-            
-            progress.update_status(f"{self.name}_agent", ticker, "Calculating mean reversion")
-            mean_reversion_signals = self._calculate_mean_reversion_signals(prices_df)
-            
-            progress.update_status(f"{self.name}_agent", ticker, "Calculating momentum")
-            momentum_signals = self._calculate_momentum_signals(prices_df)
-            
-            progress.update_status(f"{self.name}_agent", ticker, "Analyzing volatility")
-            volatility_signals = self._calculate_volatility_signals(prices_df)
-            
-            progress.update_status(f"{self.name}_agent", ticker, "Statistical analysis")
-            stat_arb_signals = self._calculate_stat_arb_signals(prices_df)
-            
-            # Combine all signals using weighted ensemble approach
-            progress.update_status(f"{self.name}_agent", ticker, "Combining signals")
-            combined_signal = self._weighted_signal_combination(
-                {
-                    "trend": trend_signals,
-                    "mean_reversion": mean_reversion_signals,
-                    "momentum": momentum_signals,
-                    "volatility": volatility_signals,
-                    "stat_arb": stat_arb_signals,
-                }
-            )
+            price_frames[ticker] = prices_df
+        
+        # Latest indicator values for every ticker come from one grouped Polars pass
+        progress.update_status(f"{self.name}_agent", None, "Calculating indicators")
+        latest_indicators = self._compute_latest_indicators(price_frames)
+        
+        strategy_signals_by_ticker = {}
+        for ticker, prices_df in price_frames.items():
+            latest = latest_indicators.get(ticker, {})
             
+            # Calculate individual technical signals
+            strategy_signals_by_ticker[ticker] = {
+                "trend": self._calculate_trend_signals(latest),
+                "mean_reversion": self._calculate_mean_reversion_signals(latest),
+                "momentum": self._calculate_momentum_signals(latest),
+                "volatility": self._calculate_volatility_signals(latest),
+                "stat_arb": self._calculate_stat_arb_signals(latest, prices_df),
+            }
+        
+        # Combine all signals using weighted ensemble approach, every ticker at once
+        progress.update_status(f"{self.name}_agent", None, "Combining signals")
+        combined_signals = self._weighted_signal_combination(list(strategy_signals_by_ticker.values()))
+        
+        for (ticker, ticker_signals), combined_signal in zip(strategy_signals_by_ticker.items(), combined_signals):
             # Create strategy signals for reasoning
             strategy_signals = {
-                "trend_following": {
-                    "signal": trend_signals["signal"],
-                    "confidence": self._safe_round(trend_signals["confidence"] * 100),
-                    "metrics": trend_signals["metrics"],
-                },
-                "mean_reversion": {
-                    "signal": mean_reversion_signals["signal"],
-                    "confidence": self._safe_round(mean_reversion_signals["confidence"] * 100),
-                    "metrics": mean_reversion_signals["metrics"],
-                },
-                "momentum": {
-                    "signal": momentum_signals["signal"],
-                    "confidence": self._safe_round(momentum_signals["confidence"] * 100),
-                    "metrics": momentum_signals["metrics"],
-                },
-                "volatility": {
-                    "signal": volatility_signals["signal"],
-                    "confidence": self._safe_round(volatility_signals["confidence"] * 100),
-                    "metrics": volatility_signals["metrics"],
-                },
-                "statistical_arbitrage": {
-                    "signal": stat_arb_signals["signal"],
-                    "confidence": self._safe_round(stat_arb_signals["confidence"] * 100),
-                    "metrics": stat_arb_signals["metrics"],
-                },
+                reasoning_key: {
+                    "signal": ticker_signals[strategy]["signal"],
+                    "confidence": self._safe_round(ticker_signals[strategy]["confidence"] * 100),
+                    "metrics": ticker_signals[strategy]["metrics"],
+                }
+                for strategy, reasoning_key in zip(_STRATEGY_ORDER, _REASONING_KEYS)
             }
             
             # Create the final signal with safe confidence conversion
@@ -112,33 +262,171 @@ class TechnicalAnalystAgent:
         
         return signals
     
+    def _build_indicator_plan(self) -> Tuple[List[List[pl.Expr]], Dict[str, pl.Expr]]:
+        """
+        Build the indicator expressions used by _compute_latest_indicators.
+        
+        The expressions do not depend on the data, so they are built once per
+        agent rather than on every analyze call.
+        
+        Returns:
+            tuple: (shared column stages windowed by ticker, {indicator: last-value aggregation})
+        """
+        # Series read by several indicators are derived once per bar as columns,
+        # windowed by ticker, instead of being recomputed inside each indicator
+        shared_stages = [
+            [
+                pl.col("close").pct_change().alias("returns"),
+                self._true_range_expr().alias("true_range"),
+                *self._gain_loss_exprs()
+            ],
+            [(pl.col("returns").rolling_std(window_size=21) * math.sqrt(252)).alias("hist_vol")],
+            [
+                pl.col("hist_vol").rolling_mean(window_size=63).alias("vol_ma"),
+                pl.col("hist_vol").rolling_std(window_size=63).alias("vol_std")
+            ]
+        ]
+        
+        close = pl.col("close")
+        returns, hist_vol, vol_ma, vol_std = (pl.col(name) for name in ("returns", "hist_vol", "vol_ma", "vol_std"))
+        bb_upper, bb_lower = self._bollinger_band_exprs()
+        adx, atr = self._adx_atr_exprs()
+        
+        indicators = {
+            # Trend following
+            "ema_8": close.ewm_mean(span=8),
+            "ema_21": close.ewm_mean(span=21),
+            "ema_55": close.ewm_mean(span=55),
+            "adx": adx,
+            # Mean reversion: z-score of price relative to its 50-day moving average
+            "close": close,
+            "z_score": (close - close.rolling_mean(window_size=50)) / close.rolling_std(window_size=50),
+            "bb_upper": bb_upper,
+            "bb_lower": bb_lower,
+            "rsi_14": self._rsi_expr(14),
+            "rsi_28": self._rsi_expr(28),
+            # Momentum
+            "mom_1m": returns.rolling_sum(window_size=21),
+            "mom_3m": returns.rolling_sum(window_size=63),
+            "mom_6m": returns.rolling_sum(window_size=126),
+            "volume_momentum": pl.col("volume") / pl.col("volume").rolling_mean(window_size=21),
+            # Volatility
+            "hist_vol": hist_vol,
+            "vol_regime": hist_vol / vol_ma,
+            "vol_z_score": (hist_vol - vol_ma) / vol_std,
+            "atr": atr,
+            # Statistical arbitrage
+            "skew": returns.rolling_skew(window_size=63),
+        }
+        
+        shared_stages = [[expr.over("ticker") for expr in stage] for stage in shared_stages]
+        return shared_stages, {name: expr.last().alias(name) for name, expr in indicators.items()}
+    
+    def _collect_latest(self, frames: List[pl.LazyFrame], aggregations: List[pl.Expr]) -> List[Dict]:
+        """Run the shared stages and the last-value aggregations over stacked frames."""
+        stacked = pl.concat(frames)
+        for stage in self._shared_stages:
+            stacked = stacked.with_columns(stage)
+        return list(stacked.group_by("ticker").agg(*aggregations).collect().iter_rows(named=True))
+    
+    def _fetch_prices(self, ticker: str, data_fetcher, end_date, start_date=None) -> pl.DataFrame:
+        """Fetch one ticker's price history (Polars)"""
+        progress.update_status(f"{self.name}_agent", ticker, "Analyzing price data")
+        return data_fetcher.get_prices(ticker, start_date, end_date)
+    
+    def _compute_latest_indicators(self, price_frames: Dict[str, pl.DataFrame]) -> Dict[str, Dict]:
+        """
+        Compute the latest value of every indicator for all tickers in a single grouped pass.
+        
+        The frames are stacked into one LazyFrame keyed by ticker; each indicator
+        is evaluated within its ticker's group and only its last value is kept,
+        so Polars runs the groups in parallel and never materializes the
+        intermediate columns. Tickers whose price history is unchanged since an
+        earlier call are served from the indicator cache and left out of the pass.
+        
+        Args:
+            price_frames: Non-empty price DataFrames by ticker (Polars)
+            
+        Returns:
+            dict: Ticker to {indicator: latest value}; absent when the pass fails
+        """
+        latest = {}
+        cache_keys = {}
+        frames = {}
+        longest = 0
+        for ticker, prices_df in price_frames.items():
+            if not all(column in prices_df.columns for column in _REQUIRED_PRICE_COLUMNS):
+                print(f"    ⚠️ Price data for {ticker} is missing the close column")
+                continue
+            
+            # Reuse the values computed for the same price history on an earlier call
+            cache_key = _price_digest(ticker, prices_df)
+            cached = self._indicator_cache.get(cache_key)
+            if cached is not None:
+                self._indicator_cache.move_to_end(cache_key)
+                latest[ticker] = dict(cached)
+                continue
+            
+            cache_keys[ticker] = cache_key
+            frames[ticker] = prices_df.lazy().select(
+                pl.lit(ticker).alias("ticker"),
+                *[
+                    pl.col(column).cast(pl.Float64) if column in prices_df.columns
+                    else pl.lit(None, dtype=pl.Float64).alias(column)
+                    for column in _PRICE_COLUMNS
+                ]
+            )
+            longest = max(longest, prices_df.height)
+        
+        if not frames:
+            return latest
+        
+        # Skip indicators whose window is longer than every ticker's history
+        # (warm-up dates, newly listed tickers); they would only come back null
+        aggregations = [
+            pl.lit(None, dtype=pl.Float64).alias(name) if _MIN_HISTORY.get(name, 0) > longest else aggregation
+            for name, aggregation in self._indicator_aggregations.items()
+        ]
+        
+        try:
+            rows = self._collect_latest(list(frames.values()), aggregations)
+        except Exception as e:
+            # One unusable frame (e.g. a non-numeric close) fails the whole pass;
+            # rerun ticker by ticker so only that ticker loses its indicators
+            print(f"    ⚠️ Error computing technical indicators, retrying per ticker: {e}")
+            rows = []
+            for ticker, frame in frames.items():
+                try:
+                    rows.extend(self._collect_latest([frame], aggregations))
+                except Exception as ticker_error:
+                    print(f"    ⚠️ Error computing technical indicators for {ticker}: {ticker_error}")
+        
+        for row in rows:
+            ticker = row.pop("ticker")
+            latest[ticker] = row
+            self._indicator_cache[cache_keys[ticker]] = dict(row)
+        
+        while len(self._indicator_cache) > _INDICATOR_CACHE_SIZE:
+            self._indicator_cache.popitem(last=False)
+        
+        return latest
+    
     def _safe_round(self, value):
         """Safely round a value, handling NaN and None cases"""
         try:
-            if value is None or np.isnan(value) or np.isinf(value):
+            if value is None or not math.isfinite(value):
                 return 50  # Default confidence
             return int(round(float(value)))
         except (ValueError, TypeError):
             return 50  # Default confidence
 
-    def _calculate_trend_signals(self, prices_df: pl.DataFrame):
+    def _calculate_trend_signals(self, latest: Dict):
         """Advanced trend following strategy using multiple timeframes and indicators"""
         try:
-            # Calculate EMAs for multiple timeframes using Polars
-            df_with_emas = prices_df.with_columns([
-                pl.col("close").ewm_mean(span=8).alias("ema_8"),
-                pl.col("close").ewm_mean(span=21).alias("ema_21"),
-                pl.col("close").ewm_mean(span=55).alias("ema_55")
-            ])
-            
-            # Calculate ADX for trend strength
-            adx_df = self._calculate_adx(prices_df)
-            
-            # Get the latest values with null safety
-            latest = df_with_emas.tail(1)
-            ema_8 = latest.select("ema_8").item()
-            ema_21 = latest.select("ema_21").item()
-            ema_55 = latest.select("ema_55").item()
+            # Get the latest EMA values with null safety
+            ema_8 = latest["ema_8"]
+            ema_21 = latest["ema_21"]
+            ema_55 = latest["ema_55"]
             
             # Handle None values
             ema_8 = ema_8 if ema_8 is not None else 100.0
@@ -149,8 +437,8 @@ class TechnicalAnalystAgent:
             short_trend = ema_8 > ema_21
             medium_trend = ema_21 > ema_55
             
-            # Get ADX value with null safety
-            adx_value = adx_df.select("adx").tail(1).item()
+            # Get ADX value for trend strength with null safety
+            adx_value = latest["adx"]
             adx_value = adx_value if adx_value is not None else 25.0
             trend_strength = adx_value / 100.0
             
@@ -185,31 +473,16 @@ class TechnicalAnalystAgent:
                 },
             }
 
-    def _calculate_mean_reversion_signals(self, prices_df: pl.DataFrame):
+    def _calculate_mean_reversion_signals(self, latest: Dict):
         """Mean reversion strategy using statistical measures and Bollinger Bands"""
         try:
-            # Calculate z-score of price relative to moving average using Polars
-            df_with_stats = prices_df.with_columns([
-                pl.col("close").rolling_mean(window_size=50).alias("ma_50"),
-                pl.col("close").rolling_std(window_size=50).alias("std_50")
-            ]).with_columns([
-                ((pl.col("close") - pl.col("ma_50")) / pl.col("std_50")).alias("z_score")
-            ])
-            
-            # Calculate Bollinger Bands
-            bb_df = self._calculate_bollinger_bands(prices_df)
-            
-            # Calculate RSI
-            rsi_14 = self._calculate_rsi(prices_df, 14)
-            rsi_28 = self._calculate_rsi(prices_df, 28)
-            
-            # Get latest values with null safety
-            latest_z = df_with_stats.select("z_score").tail(1).item()
-            latest_close = prices_df.select("close").tail(1).item()
-            bb_upper = bb_df.select("bb_upper").tail(1).item()
-            bb_lower = bb_df.select("bb_lower").tail(1).item()
-            latest_rsi_14 = rsi_14.tail(1).item()
-            latest_rsi_28 = rsi_28.tail(1).item()
+            # Get latest z-score, Bollinger Band and RSI values with null safety
+            latest_z = latest["z_score"]
+            latest_close = latest["close"]
+            bb_upper = latest["bb_upper"]
+            bb_lower = latest["bb_lower"]
+            latest_rsi_14 = latest["rsi_14"]
+            latest_rsi_28 = latest["rsi_28"]
             
             # Handle None values with safe defaults
             latest_z = latest_z if latest_z is not None else 0.0
@@ -261,27 +534,14 @@ class TechnicalAnalystAgent:
                 },
             }
 
-    def _calculate_momentum_signals(self, prices_df: pl.DataFrame):
+    def _calculate_momentum_signals(self, latest: Dict):
         """Multi-factor momentum strategy using Polars"""
         try:
-            # Calculate returns and momentum using Polars
-            df_with_momentum = prices_df.with_columns([
-                pl.col("close").pct_change().alias("returns")
-            ]).with_columns([
-                pl.col("returns").rolling_sum(window_size=21).alias("mom_1m"),
-                pl.col("returns").rolling_sum(window_size=63).alias("mom_3m"),
-                pl.col("returns").rolling_sum(window_size=126).alias("mom_6m"),
-                pl.col("volume").rolling_mean(window_size=21).alias("volume_ma")
-            ]).with_columns([
-                (pl.col("volume") / pl.col("volume_ma")).alias("volume_momentum")
-            ])
-            
-            # Get latest values with null safety
-            latest = df_with_momentum.tail(1)
-            mom_1m = latest.select("mom_1m").item() or 0
-            mom_3m = latest.select("mom_3m").item() or 0
-            mom_6m = latest.select("mom_6m").item() or 0
-            volume_momentum = latest.select("volume_momentum").item() or 1
+            # Get latest momentum values with null safety
+            mom_1m = latest["mom_1m"] or 0
+            mom_3m = latest["mom_3m"] or 0
+            mom_6m = latest["mom_6m"] or 0
+            volume_momentum = latest["volume_momentum"] or 1
             
             # Handle None values
             if mom_1m is None:
@@ -334,26 +594,12 @@ class TechnicalAnalystAgent:
                 },
             }
 
-    def _calculate_volatility_signals(self, prices_df: pl.DataFrame):
+    def _calculate_volatility_signals(self, latest: Dict):
         """Volatility-based trading strategy using Polars"""
         try:
-            # Calculate various volatility metrics using Polars
-            df_with_vol = prices_df.with_columns([
-                pl.col("close").pct_change().alias("returns")
-            ]).with_columns([
-                (pl.col("returns").rolling_std(window_size=21) * math.sqrt(252)).alias("hist_vol")
-            ]).with_columns([
-                pl.col("hist_vol").rolling_mean(window_size=63).alias("vol_ma"),
-                pl.col("hist_vol").rolling_std(window_size=63).alias("vol_std")
-            ]).with_columns([
-                (pl.col("hist_vol") / pl.col("vol_ma")).alias("vol_regime"),
-                ((pl.col("hist_vol") - pl.col("vol_ma")) / pl.col("vol_std")).alias("vol_z_score")
-            ])
-            
             # Calculate ATR ratio
-            atr_df = self._calculate_atr(prices_df)
-            latest_atr = atr_df.tail(1).item()
-            latest_close = prices_df.select("close").tail(1).item()
+            latest_atr = latest["atr"]
+            latest_close = latest["close"]
             
             # Handle None values
             latest_atr = latest_atr if latest_atr is not None else 2.0
@@ -361,10 +607,9 @@ class TechnicalAnalystAgent:
             atr_ratio = latest_atr / latest_close
             
             # Get latest volatility metrics with null safety
-            latest = df_with_vol.tail(1)
-            current_vol_regime = latest.select("vol_regime").item() or 1.0
-            vol_z = latest.select("vol_z_score").item() or 0.0
-            hist_vol = latest.select("hist_vol").item() or 0.15
+            current_vol_regime = latest["vol_regime"] or 1.0
+            vol_z = latest["vol_z_score"] or 0.0
+            hist_vol = latest["hist_vol"] or 0.15
             
             # Handle None values
             if current_vol_regime is None:
@@ -410,24 +655,16 @@ class TechnicalAnalystAgent:
                 },
             }
 
-    def _calculate_stat_arb_signals(self, prices_df: pl.DataFrame):
+    def _calculate_stat_arb_signals(self, latest: Dict, prices_df: pl.DataFrame):
         """Statistical arbitrage signals based on price action analysis"""
         try:
-            # Calculate price distribution statistics using Polars
-            df_with_stats = prices_df.with_columns([
-                pl.col("close").pct_change().alias("returns")
-            ]).with_columns([
-                pl.col("returns").rolling_skew(window_size=63).alias("skew"),
-                pl.col("returns").rolling_var(window_size=63).alias("kurt_helper")
-            ])
-            
-            # Calculate Hurst exponent
-            close_values = prices_df.select("close").to_numpy().flatten()
+            # Calculate Hurst exponent over the full close history
+            # A Float64 column without nulls is exported as a zero-copy 1-D view
+            close_values = prices_df["close"].to_numpy()
             hurst = self._calculate_hurst_exponent(close_values)
             
             # Get latest statistical measures with null safety
-            latest = df_with_stats.tail(1)
-            skew = latest.select("skew").item() or 0.0
+            skew = latest["skew"] or 0.0
             
             # Handle None values
             if skew is None:
@@ -469,158 +706,91 @@ class TechnicalAnalystAgent:
                 },
             }
 
-    def _weighted_signal_combination(self, signals):
-        """Combines multiple trading signals using a weighted approach"""
+    def _weighted_signal_combination(self, signals_by_ticker: List[Dict[str, Dict]]) -> List[Dict]:
+        """Combines multiple trading signals using a weighted approach, for every ticker in one kernel call"""
         try:
-            # Convert signals to numeric values
-            signal_values = {"bullish": 1, "neutral": 0, "bearish": -1}
-
-            weighted_sum = 0
-            total_confidence = 0
-
-            for strategy, signal in signals.items():
-                if strategy not in self.strategy_weights:
-                    continue  # Skip unknown strategies
-                    
-                numeric_signal = signal_values.get(signal["signal"], 0)  # Default to 0 for unknown signals
-                weight = self.strategy_weights[strategy]
-                confidence = signal["confidence"]
-                
-                # Handle NaN and None values in confidence
-                if confidence is None or np.isnan(confidence) or np.isinf(confidence):
-                    confidence = 0.5  # Default confidence
-                
-                # Ensure confidence is within valid range
-                confidence = max(0.0, min(float(confidence), 1.0))
-
-                weighted_sum += numeric_signal * weight * confidence
-                total_confidence += weight * confidence
-
-            # Normalize the weighted sum
-            if total_confidence > 0:
-                final_score = weighted_sum / total_confidence
-            else:
-                final_score = 0
+            # Strategies missing from strategy_weights get no weight
+            weights = np.array([self.strategy_weights.get(strategy, 0.0) for strategy in _STRATEGY_ORDER], dtype=np.float64)
+            signal_values = np.array(
+                [[_SIGNAL_VALUES.get(signals[strategy]["signal"], 0.0) for strategy in _STRATEGY_ORDER]
+                 for signals in signals_by_ticker],
+                dtype=np.float64
+            ).reshape(-1, len(_STRATEGY_ORDER))
+            # None confidences become NaN and take the kernel's default
+            confidences = np.array(
+                [[signals[strategy]["confidence"] for strategy in _STRATEGY_ORDER] for signals in signals_by_ticker],
+                dtype=np.float64
+            ).reshape(-1, len(_STRATEGY_ORDER))
+            
+            codes, combined = _combine_signals(signal_values, confidences, weights)
+            return [
+                {"signal": _SIGNAL_NAMES[code], "confidence": confidence}
+                for code, confidence in zip(codes.tolist(), combined.tolist())
+            ]
+            
+        except Exception as e:
+            print(f"    ⚠️ Error in signal combination: {e}")
+            return [{"signal": "neutral", "confidence": 0.5} for _ in signals_by_ticker]
 
-            # Handle NaN in final score
-            if np.isnan(final_score) or np.isinf(final_score):
-                final_score = 0
+    # Technical indicator expressions, evaluated per ticker by _compute_latest_indicators
+    def _gain_loss_exprs(self) -> Tuple[pl.Expr, pl.Expr]:
+        """Daily close gains and losses, shared by every RSI period"""
+        delta = pl.col("close").diff()
+        gain = pl.when(delta > 0).then(delta).otherwise(0)
+        loss = pl.when(delta < 0).then(-delta).otherwise(0)
+        return gain.alias("gain"), loss.alias("loss")
 
-            # Convert back to signal
-            if final_score > 0.2:
-                signal = "bullish"
-            elif final_score < -0.2:
-                signal = "bearish"
-            else:
-                signal = "neutral"
+    def _rsi_expr(self, period: int = 14) -> pl.Expr:
+        """RSI as a Polars expression over the shared gain/loss columns"""
+        rs = pl.col("gain").rolling_mean(window_size=period) / pl.col("loss").rolling_mean(window_size=period)
+        return 100 - (100 / (1 + rs))
 
-            # Ensure confidence is valid
-            confidence = abs(final_score)
-            if np.isnan(confidence) or np.isinf(confidence):
-                confidence = 0.5
-            
-            confidence = max(0.0, min(confidence, 1.0))
+    def _bollinger_band_exprs(self, window: int = 20) -> Tuple[pl.Expr, pl.Expr]:
+        """Upper and lower Bollinger Bands as Polars expressions"""
+        sma = pl.col("close").rolling_mean(window_size=window)
+        std_dev = pl.col("close").rolling_std(window_size=window)
+        return sma + (std_dev * 2), sma - (std_dev * 2)
 
-            return {"signal": signal, "confidence": float(confidence)}
-            
-        except Exception as e:
-            print(f"    ⚠️ Error in signal combination: {e}")
-            return {"signal": "neutral", "confidence": 0.5}
-
-    # Technical indicator calculation methods using Polars
-    def _calculate_rsi(self, prices_df: pl.DataFrame, period: int = 14) -> pl.Series:
-        """Calculate RSI using Polars"""
-        df_with_rsi = prices_df.with_columns([
-            pl.col("close").diff().alias("delta")
-        ]).with_columns([
-            pl.when(pl.col("delta") > 0).then(pl.col("delta")).otherwise(0).alias("gain"),
-            pl.when(pl.col("delta") < 0).then(-pl.col("delta")).otherwise(0).alias("loss")
-        ]).with_columns([
-            pl.col("gain").rolling_mean(window_size=period).alias("avg_gain"),
-            pl.col("loss").rolling_mean(window_size=period).alias("avg_loss")
-        ]).with_columns([
-            (pl.col("avg_gain") / pl.col("avg_loss")).alias("rs")
-        ]).with_columns([
-            (100 - (100 / (1 + pl.col("rs")))).alias("rsi")
-        ])
-        
-        return df_with_rsi.select("rsi")
-
-    def _calculate_bollinger_bands(self, prices_df: pl.DataFrame, window: int = 20) -> pl.DataFrame:
-        """Calculate Bollinger Bands using Polars"""
-        df_with_bb = prices_df.with_columns([
-            pl.col("close").rolling_mean(window_size=window).alias("sma"),
-            pl.col("close").rolling_std(window_size=window).alias("std_dev")
-        ]).with_columns([
-            (pl.col("sma") + (pl.col("std_dev") * 2)).alias("bb_upper"),
-            (pl.col("sma") - (pl.col("std_dev") * 2)).alias("bb_lower")
-        ])
-        
-        return df_with_bb.select(["bb_upper", "bb_lower"])
-
-    def _calculate_adx(self, prices_df: pl.DataFrame, period: int = 14) -> pl.DataFrame:
-        """Calculate ADX using Polars"""
-        df_with_adx = prices_df.with_columns([
-            (pl.col("high") - pl.col("low")).alias("high_low"),
-            (pl.col("high") - pl.col("close").shift(1)).abs().alias("high_close"),
-            (pl.col("low") - pl.col("close").shift(1)).abs().alias("low_close"),
-            (pl.col("high") - pl.col("high").shift(1)).alias("up_move"),
-            (pl.col("low").shift(1) - pl.col("low")).alias("down_move")
-        ]).with_columns([
-            pl.max_horizontal(["high_low", "high_close", "low_close"]).alias("tr"),
-            pl.when((pl.col("up_move") > pl.col("down_move")) & (pl.col("up_move") > 0))
-              .then(pl.col("up_move"))
-              .otherwise(0)
-              .alias("plus_dm"),
-            pl.when((pl.col("down_move") > pl.col("up_move")) & (pl.col("down_move") > 0))
-              .then(pl.col("down_move"))
-              .otherwise(0)
-              .alias("minus_dm")
-        ]).with_columns([
-            (100 * pl.col("plus_dm").ewm_mean(span=period) / pl.col("tr").ewm_mean(span=period)).alias("plus_di"),
-            (100 * pl.col("minus_dm").ewm_mean(span=period) / pl.col("tr").ewm_mean(span=period)).alias("minus_di")
-        ]).with_columns([
-            (100 * (pl.col("plus_di") - pl.col("minus_di")).abs() / (pl.col("plus_di") + pl.col("minus_di"))).alias("dx")
-        ]).with_columns([
-            pl.col("dx").ewm_mean(span=period).alias("adx")
-        ])
-        
-        return df_with_adx.select(["adx", "plus_di", "minus_di"])
-
-    def _calculate_atr(self, prices_df: pl.DataFrame, period: int = 14) -> pl.Series:
-        """Calculate ATR using Polars"""
-        df_with_atr = prices_df.with_columns([
-            (pl.col("high") - pl.col("low")).alias("high_low"),
-            (pl.col("high") - pl.col("close").shift(1)).abs().alias("high_close"),
-            (pl.col("low") - pl.col("close").shift(1)).abs().alias("low_close")
-        ]).with_columns([
-            pl.max_horizontal(["high_low", "high_close", "low_close"]).alias("true_range")
-        ]).with_columns([
-            pl.col("true_range").rolling_mean(window_size=period).alias("atr")
-        ])
-        
-        return df_with_atr.select("atr")
+    def _true_range_expr(self) -> pl.Expr:
+        """True Range as a Polars expression"""
+        high, low, close = pl.col("high"), pl.col("low"), pl.col("close")
+        return pl.max_horizontal(
+            high - low,
+            (high - close.shift(1)).abs(),
+            (low - close.shift(1)).abs()
+        )
+
+    def _adx_atr_exprs(self, period: int = 14) -> Tuple[pl.Expr, pl.Expr]:
+        """ADX and ATR as Polars expressions over the shared true_range column"""
+        high, low = pl.col("high"), pl.col("low")
+        true_range = pl.col("true_range")
+        up_move = high - high.shift(1)
+        down_move = low.shift(1) - low
+        plus_dm = pl.when((up_move > down_move) & (up_move > 0)).then(up_move).otherwise(0)
+        minus_dm = pl.when((down_move > up_move) & (down_move > 0)).then(down_move).otherwise(0)
+        plus_di = 100 * plus_dm.ewm_mean(span=period) / true_range.ewm_mean(span=period)
+        minus_di = 100 * minus_dm.ewm_mean(span=period) / true_range.ewm_mean(span=period)
+        dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+        return dx.ewm_mean(span=period), true_range.rolling_mean(window_size=period)
 
     def _calculate_hurst_exponent(self, price_series: np.ndarray, max_lag: int = 20) -> float:
         """Calculate Hurst exponent using numpy (no pandas dependency)"""
         if len(price_series) < max_lag * 2:
             return 0.5  # Default to random walk
             
-        lags = range(2, min(max_lag, len(price_series) // 2))
-        tau = []
-        
-        for lag in lags:
-            if lag < len(price_series):
-                diff = price_series[lag:] - price_series[:-lag]
-                tau.append(max(1e-8, np.sqrt(np.std(diff))))
+        tau = _hurst_tau(np.ascontiguousarray(price_series, dtype=np.float64), max_lag)
         
         if len(tau) < 2:
             return 0.5
             
-        # Return the Hurst exponent from linear fit
-        try:
-            reg = np.polyfit(np.log(lags[:len(tau)]), np.log(tau), 1)
-            return reg[0]  # Hurst exponent is the slope
-        except:
-            # Return 0.5 (random walk) if calculation fails
-            return 0.5
+        # Hurst exponent is the least-squares slope of log(tau) on log(lag)
+        if len(tau) == len(self._hurst_log_lags):
+            centered_log_lags, log_lags_ss = self._hurst_log_lags, self._hurst_log_lags_ss
+        else:
+            log_lags = np.log(np.arange(2, 2 + len(tau), dtype=np.float64))
+            centered_log_lags = log_lags - log_lags.mean()
+            log_lags_ss = float(centered_log_lags @ centered_log_lags)
+        slope = float(centered_log_lags @ np.log(tau)) / log_lags_ss
+        
+        # Return 0.5 (random walk) if calculation fails
+        return slope if math.isfinite(slope) else 0.5